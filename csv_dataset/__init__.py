@@ -4,8 +4,29 @@ from .reader import (
     AbstractReader,
     CsvReader
 )
+from .array import ArrayReader
+from .cache import ParsedCache
+from .resample import ResampleReader
+from .merge import MergeReader
+from .features import RollingFeatures
+from .shard import ShardReader
 from .dataset import Dataset
+from .multi import (
+    MultiDataset,
+    DatasetView
+)
 from .normalizer import (
     RangeNormalizer,
     NormalizerProtocol
 )
+
+
+def __getattr__(name: str):
+    if name == 'ParallelDataset':
+        # Imported lazily, since multiprocessing.shared_memory
+        # requires Python 3.8
+        from .parallel import ParallelDataset
+
+        return ParallelDataset
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
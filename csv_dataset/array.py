@@ -0,0 +1,153 @@
+from typing import (
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union
+)
+
+import numpy as np
+
+from .reader import (
+    AbstractReader,
+    T
+)
+
+
+ArrayLike = Union[np.ndarray, Sequence[np.ndarray]]
+
+
+def _to_array(data) -> Union[np.ndarray, Tuple[np.ndarray, ...]]:
+    if hasattr(data, 'to_numpy'):
+        # pandas.DataFrame, which does not copy if all columns
+        # have the same dtype and are in a single block
+        return data.to_numpy()
+
+    if isinstance(data, (list, tuple)):
+        # Column buffers, which are kept as they are,
+        # and only the lines being read are stacked
+        columns = tuple(np.asarray(column) for column in data)
+
+        if not columns:
+            raise ValueError('data must have at least one column')
+
+        if any(column.ndim != 1 for column in columns):
+            raise ValueError('columns of data must be 1-dimensional')
+
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError('columns of data must have the same length')
+
+        return columns
+
+    return np.asarray(data)
+
+
+class ArrayReader(AbstractReader[T]):
+    """Reads the lines of an in-memory 2-D array without copying.
+
+    If `data` is a sequence of column arrays, the columns are not stacked up front, and each read stacks the lines being read into a new array.
+
+    Args:
+        data (np.ndarray | pandas.DataFrame | Sequence[np.ndarray]): a 2-D array of shape `(lines, columns)`, an object with `to_numpy()` such as a pandas DataFrame, or a sequence of 1-D column arrays
+        max_lines (:obj:`int`, optional)
+    """
+
+    def __init__(
+        self,
+        data: ArrayLike,
+        max_lines: Optional[int] = None
+    ):
+        array = _to_array(data)
+
+        self._array: Optional[np.ndarray] = None
+        self._columns_data: Optional[Tuple[np.ndarray, ...]] = None
+
+        if isinstance(array, tuple):
+            self._columns_data = array
+            self._length = len(array[0])
+            dtype = np.result_type(*array)
+        else:
+            if array.ndim != 2:
+                raise ValueError(
+                    f'data must be 2-dimensional, but got shape {array.shape}'
+                )
+
+            self._array = array
+            self._length = len(array)
+            dtype = array.dtype
+
+        self.dtype = int if dtype.kind in 'iu' else float
+
+        self.max_lines = max_lines
+
+        self.reset()
+
+    @property
+    def columns(self) -> int:
+        if self._columns_data is not None:
+            return len(self._columns_data)
+
+        return self._array.shape[1]
+
+    @property
+    def array(self) -> Optional[np.ndarray]:
+        # Column buffers have no single array to be viewed
+        return self._array
+
+    @property
+    def offset(self) -> int:
+        """The index of the next line to read in `reader.array`
+        """
+
+        return self._offset
+
+    @property
+    def max_lines(self) -> Optional[int]:
+        lines = self._length
+
+        return lines if self._max_lines is None else min(
+            self._max_lines, lines
+        )
+
+    @max_lines.setter
+    def max_lines(self, max_lines: Optional[int]) -> None:
+        self._set_max_lines(max_lines)
+
+    @property
+    def lines(self) -> int:
+        """How many lines the reader has read
+        """
+
+        return self._lines
+
+    def reset(self) -> None:
+        self._lines = 0
+        self._offset = 0
+
+    def tail(self, lines: int) -> None:
+        self._lines = 0
+        self._offset = max(0, self._length - lines)
+
+    def readlines(self, lines: int) -> np.ndarray:
+        if self._max_lines is not None:
+            lines = min(lines, self._max_lines - self._lines)
+
+        start = self._offset
+        end = min(start + max(lines, 0), self._length)
+
+        if self._columns_data is None:
+            read = self._array[start:end]
+        else:
+            read = np.column_stack([
+                column[start:end] for column in self._columns_data
+            ])
+
+        self._lines += len(read)
+        self._offset = end
+
+        return read
+
+    def readline(self) -> Optional[List[T]]:
+        lines = self.readlines(1)
+
+        return lines[0].tolist() if len(lines) else None
@@ -0,0 +1,177 @@
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Set
+)
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+
+MAX_BYTES = 512 * 1024 * 1024
+
+
+class ParsedCache:
+    """A thread-safe LRU cache of parsed lines with a memory budget, which could be shared by readers across the process.
+
+    Cached arrays are read-only since they are shared.
+
+    Args:
+        max_bytes (:obj:`int`, optional): the max total bytes of cached arrays
+    """
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self._lock = threading.RLock()
+        self._entries: 'OrderedDict[Hashable, np.ndarray]' = OrderedDict()
+        # The locks of the keys being parsed,
+        # so that each key is only parsed once at the same time
+        self._parsing: Dict[Hashable, threading.Lock] = {}
+        # The keys whose lines are larger than the budget
+        self._oversized: Set[Hashable] = set()
+
+        self._max_bytes = max_bytes
+        self.clear()
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int) -> None:
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._oversized.clear()
+            self._evict(0)
+
+    @property
+    def stats(self) -> dict:
+        """The statistics of the cache
+        """
+
+        with self._lock:
+            return dict(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                entries=len(self._entries),
+                bytes=self.bytes
+            )
+
+    def clear(self) -> None:
+        """Removes all entries and resets the statistics
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._oversized.clear()
+
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.bytes = 0
+
+    def _evict(self, size: int) -> None:
+        """Evicts least recently used entries until there is room for `size` bytes
+        """
+
+        while self._entries and self.bytes + size > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            array = self._entries.get(key)
+
+            if array is None:
+                self.misses += 1
+                return
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+            return array
+
+    def put(self, key: Hashable, array: np.ndarray) -> np.ndarray:
+        """Caches the array if it fits into the budget
+
+        Returns:
+            np.ndarray: the read-only array
+        """
+
+        array.setflags(write=False)
+
+        with self._lock:
+            if array.nbytes > self._max_bytes:
+                return array
+
+            previous = self._entries.pop(key, None)
+
+            if previous is not None:
+                self.bytes -= previous.nbytes
+
+            self._evict(array.nbytes)
+
+            self._entries[key] = array
+            self.bytes += array.nbytes
+
+        return array
+
+    def get_or_parse(
+        self,
+        key: Hashable,
+        parse: Callable[[int], Optional[np.ndarray]]
+    ) -> Optional[np.ndarray]:
+        """Gets the cached array of `key`, or parses and caches it
+
+        Args:
+            key (Hashable)
+            parse (Callable[[int], Optional[np.ndarray]]): receives the max bytes, and returns None if the parsed lines would be larger than it
+
+        Returns:
+            Optional[np.ndarray]: None if the lines of `key` are larger than the budget
+        """
+
+        with self._lock:
+            if key in self._oversized:
+                return
+
+        array = self.get(key)
+
+        if array is not None:
+            return array
+
+        with self._lock:
+            lock = self._parsing.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._lock:
+                if key in self._oversized:
+                    return
+
+                # Another thread might have parsed it
+                array = self._entries.get(key)
+
+                if array is not None:
+                    self._entries.move_to_end(key)
+                    return array
+
+            try:
+                array = parse(self._max_bytes)
+
+                if array is None or array.nbytes > self._max_bytes:
+                    with self._lock:
+                        self._oversized.add(key)
+                    return
+
+                return self.put(key, array)
+            finally:
+                with self._lock:
+                    self._parsing.pop(key, None)
+
+
+# The cache shared by the readers of the process
+default_cache = ParsedCache()
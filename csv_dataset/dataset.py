@@ -1,4 +1,6 @@
 from typing import (
+    List,
+    Sequence,
     Optional,
     TypeVar,
     Generic
@@ -9,6 +11,19 @@ import numpy as np
 from common_decorators import lazy
 
 from .reader import AbstractReader
+from .resample import (
+    ResampleReader,
+    Aggregation
+)
+from .features import (
+    RollingFeatures,
+    FEATURES
+)
+from .shard import (
+    ShardReader,
+    save_shards,
+    SHARD_SIZE
+)
 from .common import (
     rolling_window,
     max_lines_error
@@ -16,31 +31,24 @@ from .common import (
 
 T = TypeVar('T')
 
+# - 'drop': drops the lines which are not enough for a whole batch
+# - 'pad': pads the last batch, see `Dataset.mask`
+# - 'partial': reads the complete windows of the last batch
+REMAINDERS = ('drop', 'pad', 'partial')
 
-class Dataset(Generic[T]):
-    _reader: AbstractReader[T]
 
-    def __init__(
-        self,
-        reader: AbstractReader[T]
-    ):
-        self._reader = reader
-        self._buffer_read = False
+class WindowSpec:
+    """The window and batch settings shared by `Dataset` and `DatasetView`
+    """
 
+    _buffer_read: bool
+
+    def __init__(self):
         self._batch = 1
 
         self._window_size = 1
         self._window_shift = 1
         self._window_stride = 1
-        self._window_drop_remainder = False
-
-        self.reset()
-
-    def reset(self) -> None:
-        self._reader.reset()
-        self._buffer = None
-
-        return self
 
     # |-------- size:3 --------|
     # |- stride:1 -|           |
@@ -86,6 +94,111 @@ class Dataset(Generic[T]):
 
         return self._least + (reads - 1) * self._stride
 
+    def _check_start(self, method_name: str):
+        if self._buffer_read:
+            raise RuntimeError(f'calling {method_name}() during reading is forbidden')
+
+    def window(
+        self,
+        size: int,
+        shift: Optional[int] = None,
+        stride: int = 1
+    ) -> 'Dataset':
+        """Combines (nests of) input elements into a dataset of (nests of) windows.
+        """
+
+        self._check_start('window')
+
+        self._window_size = size
+        self._window_shift = shift or size
+        self._window_stride = stride
+
+        return self
+
+    def batch(
+        self,
+        batch: int
+    ) -> 'Dataset':
+        """Combines consecutive elements of this dataset into batches.
+        """
+
+        self._check_start('batch')
+
+        self._batch = batch
+
+        return self
+
+    def _window_and_batch(self, array: np.ndarray) -> np.ndarray:
+        """Gets the first batch of `array` which has at least `self._least` lines
+        """
+
+        windowed = array if self._window_size == 1 else rolling_window(
+            array,
+            self._window_size,
+            shift=self._window_shift,
+            stride=self._window_stride
+        )
+
+        batched = windowed if self._batch == 1 else rolling_window(
+            windowed,
+            self._batch
+        )
+
+        return batched[0]
+
+
+class Dataset(WindowSpec, Generic[T]):
+    _reader: AbstractReader[T]
+
+    def __init__(
+        self,
+        reader: AbstractReader[T]
+    ):
+        super().__init__()
+
+        self._reader = reader
+        self._buffer_read = False
+
+        self._feature_names: List[str] = []
+        self._feature_period: Optional[int] = None
+
+        self._remainder = 'drop'
+        self._pad_value = 0
+
+        self.reset()
+
+    def reset(self) -> None:
+        self._reader.reset()
+        self._features: Optional[RollingFeatures] = None
+        self.reset_buffer()
+
+        return self
+
+    @property
+    def mask(self) -> Optional[np.ndarray]:
+        """The boolean mask of the last batch read by `get()`, of the shape of the batch without the last (column) axis, in which padded lines are `False`. None if there is no batch.
+        """
+
+        if self._mask is None and self._batch_shape is not None:
+            return np.ones(self._batch_shape[:-1], dtype=bool)
+
+        return self._mask
+
+    def lines_need(self, reads: int) -> int:
+        """Calculate how many lines of datum needed for reading `reads` times
+        """
+
+        if self._remainder == 'drop':
+            return super().lines_need(reads)
+
+        if reads == 1:
+            return self._min_valid
+
+        # The lines of the last read
+        rest = max(1, self._stride - self._least + self._min_valid)
+
+        return super().lines_need(reads - 1) + rest
+
     def max_reads(self, max_lines: Optional[int] = None) -> Optional[int]:
         """How many reads does the current dataset afford
 
@@ -100,74 +213,215 @@ class Dataset(Generic[T]):
         if max_lines is None:
             max_lines = self._reader.max_lines
 
-        if max_lines is None:
-            return None
-
-        if max_lines <= 0:
+            if max_lines is None:
+                return None
+        elif max_lines <= 0:
             raise max_lines_error(max_lines)
 
         rest = max_lines - self._least
+        reads = 0 if rest < 0 else 1 + rest // self._stride
 
-        return 0 if rest < 0 else 1 + rest // self._stride
+        if self._remainder == 'drop':
+            return reads
 
-    def _check_start(self, method_name: str):
-        if self._buffer_read:
-            raise RuntimeError(f'calling {method_name}() during reading is forbidden')
+        rest = max_lines - (super().lines_need(reads) if reads else 0)
 
-    def window(
+        if rest and self._valid_lines(reads > 0, rest) >= self._min_valid:
+            # The last batch of the remainder
+            reads += 1
+
+        return reads
+
+    def remainder(
         self,
-        size: int,
-        shift: Optional[int] = None,
-        stride: int = 1
+        mode: str,
+        pad_value: float = 0
     ) -> 'Dataset':
-        """Combines (nests of) input elements into a dataset of (nests of) windows.
+        """Defines how to handle the last lines which are not enough for a whole batch.
+
+        Args:
+            mode (str):
+                - 'drop': drops them, which is the default
+                - 'pad': reads a last batch of the full shape, in which the missing lines are filled with `pad_value`. See `dataset.mask`
+                - 'partial': reads a last batch which only contains the complete windows, so that the batch has fewer windows
+            pad_value (:obj:`float`, optional): the value of the padded lines
         """
 
-        self._check_start('window')
+        self._check_start('remainder')
 
-        self._window_size = size
-        self._window_shift = shift or size
-        self._window_stride = stride
+        if mode not in REMAINDERS:
+            raise ValueError(
+                f'remainder must be one of {REMAINDERS}, but got `{mode}`'
+            )
+
+        self._remainder = mode
+        self._pad_value = pad_value
 
         return self
 
-    def batch(
+    @property
+    def _min_valid(self) -> int:
+        """The least number of valid lines of the last batch of the remainder
+        """
+
+        return 1 if self._remainder == 'pad' else self._single_least
+
+    def _valid_lines(self, extend: bool, read: int) -> int:
+        """The number of valid lines of the buffer if only `read` lines are read
+        """
+
+        return self._least + read - self._stride if extend else read
+
+    def _pad(self, lines: Sequence) -> Sequence:
+        """Pads the valid lines of the remainder to a whole buffer
+        """
+
+        if len(lines) < self._min_valid:
+            return []
+
+        lines = np.asarray(lines)
+        self._valid = len(lines)
+
+        return np.concatenate((
+            lines,
+            np.full(
+                (self._least - self._valid,) + lines.shape[1:],
+                self._pad_value,
+                dtype=lines.dtype
+            )
+        ))
+
+    def resample(
         self,
-        batch: int
+        aggregations: List[Aggregation],
+        count: Optional[int] = None,
+        key: Optional[int] = None,
+        interval: Optional[float] = None
     ) -> 'Dataset':
-        """Combines consecutive elements of this dataset into batches.
+        """Aggregates groups of consecutive lines before windowing.
+
+        See `ResampleReader` for the parameters.
         """
 
-        self._check_start('batch')
+        self._check_start('resample')
 
-        self._batch = batch
+        self._reader = ResampleReader(
+            self._reader,
+            aggregations,
+            count=count,
+            key=key,
+            interval=interval
+        )
+
+        return self
+
+    def features(
+        self,
+        names: List[str] = list(FEATURES),
+        period: Optional[int] = None
+    ) -> 'Dataset':
+        """Appends the rolling features of each line as extra columns.
+
+        Args:
+            names (:obj:`List[str]`, optional): the features, defaults to all features
+            period (:obj:`int`, optional): the number of lines of the rolling window. Defaults to the number of lines covered by a single window
+        """
+
+        self._check_start('features')
+
+        # Validate arguments in advance
+        RollingFeatures(names, period or 1)
+
+        self._feature_names = names
+        self._feature_period = period
 
         return self
 
+    def _read_new_lines(self, lines: int) -> Sequence:
+        """Reads at most `lines` new lines with features
+        """
+
+        new_lines = self._reader.readlines(lines)
+
+        if self._feature_names and len(new_lines):
+            if self._features is None:
+                self._features = RollingFeatures(
+                    self._feature_names,
+                    self._feature_period or self._single_least
+                )
+
+            new_lines = np.array(new_lines, dtype=float)
+            new_lines = np.concatenate(
+                (new_lines, self._features.compute(new_lines)),
+                axis=1
+            )
+
+        return new_lines
+
     def _readlines(
         self,
         lines: int,
         dest_buffer: list,
         slice_size: bool = False
     ) -> list:
-        read = 0
+        new_lines = self._read_new_lines(lines)
+        read = len(new_lines)
 
-        while read < lines:
-            line = self._reader.readline()
+        if read < lines:
+            # Reaches EOF
+            if self._remainder == 'drop' or not read:
+                return []
+
+            valid = self._valid_lines(slice_size, read)
 
-            if line is None:
-                # Reaches EOF
+            if valid <= 0:
                 return []
 
-            dest_buffer.append(line)
-            read += 1
+            dest_buffer.extend(new_lines)
+
+            return self._pad(dest_buffer[len(dest_buffer) - valid:])
+
+        dest_buffer.extend(new_lines)
 
         if slice_size:
             dest_buffer = dest_buffer[lines:]
 
         return dest_buffer
 
+    def _read_array_buffer(self, array: np.ndarray) -> None:
+        """Reads lines from the array of the reader, and uses a view of the array as the buffer without copying
+        """
+
+        extend = self._buffer is not None
+        lines = self._stride if extend else self._least
+        self._buffer_read = True
+
+        read = len(self._reader.readlines(lines))
+        end = self._reader.offset
+
+        if read < lines:
+            # Reaches EOF
+            valid = self._valid_lines(extend, read)
+
+            self._buffer = [] if (
+                self._remainder == 'drop' or not read or valid <= 0
+            ) else self._pad(array[end - valid:end])
+            return
+
+        self._buffer = array[end - self._least:end]
+
     def _read_buffer(self):
+        if self._valid is not None:
+            # The remainder has been read
+            self._buffer = []
+            return
+
+        array = self._reader.array
+
+        if array is not None and not self._feature_names:
+            self._read_array_buffer(array)
+            return
+
         if self._buffer is None:
             # Initialize buffer
             self._buffer_read = True
@@ -182,30 +436,159 @@ class Dataset(Generic[T]):
 
         self._read_buffer()
 
-        if not self._buffer:
+        return self._batch_of_buffer()
+
+    def _batch_of_buffer(self) -> Optional[np.ndarray]:
+        if not len(self._buffer):
             # There is no data,
             # which indicates that the data has been exhausted
+            self._batch_shape = None
+            self._mask = None
             return
 
-        array = np.array(self._buffer)
+        batch = self._window_and_batch(np.asarray(self._buffer))
 
-        windowed = array if self._window_size == 1 else rolling_window(
-            array,
-            self._window_size,
-            shift=self._window_shift,
-            stride=self._window_stride
-        )
+        if self._valid is not None:
+            batch = self._mask_remainder(batch)
 
-        batched = windowed if self._batch == 1 else rolling_window(
-            windowed,
-            self._batch
-        )
+        self._batch_shape = batch.shape
 
-        return batched[0]
+        return batch
+
+    def _mask_remainder(self, batch: np.ndarray) -> np.ndarray:
+        mask = self._window_and_batch(np.arange(self._least) < self._valid)
+
+        if self._remainder == 'partial':
+            # The windows of a batch are in order,
+            # so the complete windows are at the beginning
+            complete = (
+                self._valid - self._single_least
+            ) // self._single_stride + 1
+
+            batch = batch[:complete]
+            mask = mask[:complete]
+
+        self._mask = mask
+
+        return batch
 
     def reset_buffer(self) -> None:
         self._buffer = None
 
+        # The number of valid lines of the padded remainder buffer
+        self._valid: Optional[int] = None
+        self._mask: Optional[np.ndarray] = None
+        self._batch_shape = None
+
+    def latest(self) -> Optional[np.ndarray]:
+        """Gets the batch of the latest lines of the reader, which requires the reader to support `tail()`.
+
+        If features are enabled, the lines before the batch are also read to compute the features, so that the features are the same as those of the batch read by `get()`
+        """
+
+        if type(self._reader).tail is AbstractReader.tail:
+            raise TypeError(
+                f'{type(self._reader).__name__} does not support tail(), so latest() is unavailable'
+            )
+
+        warmup = 0
+
+        if self._feature_names:
+            period = self._feature_period or self._single_least
+            # 'return' needs the previous line even if period is 1
+            warmup = max(period - 1, int('return' in self._feature_names))
+
+        self._reader.tail(self._least + warmup)
+        self.reset_buffer()
+        self._features = None
+
+        if warmup:
+            lines = self._read_new_lines(self._least + warmup)
+
+            if len(lines) >= self._least:
+                # Drops the lines which only warm up the features
+                self._buffer_read = True
+                self._buffer = lines[len(lines) - self._least:]
+
+                return self._batch_of_buffer()
+
+            # The reader has fewer lines, which are all read from the start
+            self._reader.tail(self._least)
+            self.reset_buffer()
+            self._features = None
+
+        return self.get()
+
+    def save(
+        self,
+        dirpath: str,
+        shard_size: int = SHARD_SIZE
+    ) -> int:
+        """Saves the lines of the dataset (after resampling and features) and the window, batch and remainder settings as `.npy` shards, which could be replayed by `Dataset.load()` without parsing the csv file again.
+
+        Args:
+            dirpath (str): the directory to save shards to
+            shard_size (:obj:`int`, optional): the max number of lines of each shard
+
+        Returns:
+            int: the total number of lines saved
+        """
+
+        self.reset()
+
+        def chunks():
+            while True:
+                lines = self._read_new_lines(shard_size)
+
+                if len(lines):
+                    yield np.asarray(lines)
+
+                if len(lines) < shard_size:
+                    return
+
+        total = save_shards(
+            dirpath,
+            chunks(),
+            window=dict(
+                size=self._window_size,
+                shift=self._window_shift,
+                stride=self._window_stride
+            ),
+            batch=self._batch,
+            remainder=dict(
+                mode=self._remainder,
+                pad_value=self._pad_value
+            )
+        )
+
+        self.reset()
+
+        return total
+
+    @staticmethod
+    def load(
+        dirpath: str,
+        mmap_mode: Optional[str] = 'r',
+        workers: Optional[int] = None
+    ) -> 'Dataset':
+        """Creates a dataset from the shards saved by `dataset.save()` with the same window, batch and remainder settings
+
+        Args:
+            dirpath (str): the directory of the shards
+            mmap_mode (:obj:`str`, optional): the memory-map mode of the shards. If None, shards will be loaded into memory
+            workers (:obj:`int`, optional): if specified, shards are loaded by `workers` threads in parallel
+        """
+
+        reader = ShardReader(dirpath, mmap_mode=mmap_mode, workers=workers)
+        manifest = reader.manifest
+
+        return Dataset(reader).window(**manifest['window']).batch(
+            manifest['batch']
+        ).remainder(
+            # Shards saved by older versions have no remainder settings
+            **manifest.get('remainder', dict(mode='drop'))
+        )
+
     def read(
         self,
         amount: int,
@@ -0,0 +1,210 @@
+from typing import (
+    List,
+    Dict,
+    Optional
+)
+
+import numpy as np
+
+
+FEATURES = ('mean', 'std', 'min', 'max', 'return')
+
+# The sliding reductions needed by each feature
+REDUCTIONS = {
+    'mean': ('sum',),
+    'std': ('sum', 'sumsq'),
+    'min': ('min',),
+    'max': ('max',)
+}
+
+UFUNCS = {
+    'sum': np.add,
+    'sumsq': np.add,
+    'min': np.minimum,
+    'max': np.maximum
+}
+
+
+class RollingFeatures:
+    """Computes the rolling features over the last `period` lines for each line of a stream.
+
+    The stream is split into blocks of `period` lines. The window of `period` lines which ends at a line always consists of a suffix of the previous block and a prefix of the current block, so each sliding reduction costs O(1) amortized per line, and is vectorized over columns and over the lines of each `compute()`.
+
+    Args:
+        names (List[str]): the features, see `FEATURES`
+        period (int): the number of lines of the rolling window
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        period: int
+    ):
+        for name in names:
+            if name not in FEATURES:
+                raise ValueError(
+                    f'feature must be one of {FEATURES}, but got `{name}`'
+                )
+
+        if period <= 0:
+            raise ValueError(f'period must be positive, but got `{period}`')
+
+        self._names = names
+        self._period = period
+        self._reductions = {
+            reduction
+            for name in names
+            for reduction in REDUCTIONS.get(name, ())
+        }
+
+        self.reset()
+
+    def reset(self) -> None:
+        # How many lines have been computed
+        self._seen = 0
+        self._last: Optional[np.ndarray] = None
+
+        # Sums are calculated relative to the first line to avoid
+        # catastrophic cancellation when calculating variances
+        self._origin: Optional[np.ndarray] = None
+
+        self._block: Optional[np.ndarray] = None
+        # How many lines the current block has
+        self._filled = 0
+
+        self._prefix: Dict[str, np.ndarray] = {}
+        # The suffix reductions of the previous block
+        self._suffix: Optional[Dict[str, np.ndarray]] = None
+
+    def _values(self, reduction: str, lines: np.ndarray) -> np.ndarray:
+        if reduction == 'sum':
+            return lines - self._origin
+
+        if reduction == 'sumsq':
+            relative = lines - self._origin
+            return relative * relative
+
+        return lines
+
+    def _reduce_segment(self, segment: np.ndarray) -> Dict[str, np.ndarray]:
+        """Reduces a segment of lines which are within a single block
+        """
+
+        begin = self._filled
+        period = self._period
+
+        if self._block is None:
+            self._block = np.empty((period,) + segment.shape[1:])
+
+        self._block[begin:begin + len(segment)] = segment
+
+        # The index in the previous block where the window of each line starts
+        starts = np.arange(begin, begin + len(segment)) + 1
+        spanned = starts < period
+
+        reduced = {}
+
+        for reduction in self._reductions:
+            ufunc = UFUNCS[reduction]
+            prefix = ufunc.accumulate(
+                self._values(reduction, segment),
+                axis=0
+            )
+
+            if begin:
+                prefix = ufunc(prefix, self._prefix[reduction])
+
+            self._prefix[reduction] = prefix[-1]
+
+            result = prefix
+
+            if self._suffix is not None:
+                result = prefix.copy()
+                result[spanned] = ufunc(
+                    prefix[spanned],
+                    self._suffix[reduction][starts[spanned]]
+                )
+
+            reduced[reduction] = result
+
+        self._filled += len(segment)
+
+        if self._filled == period:
+            # The block is complete
+            self._suffix = {
+                reduction: UFUNCS[reduction].accumulate(
+                    self._values(reduction, self._block)[::-1],
+                    axis=0
+                )[::-1]
+                for reduction in self._reductions
+            }
+            self._filled = 0
+
+        return reduced
+
+    def compute(self, lines: np.ndarray) -> np.ndarray:
+        """Computes the features of the next lines of the stream
+
+        Args:
+            lines (np.ndarray): the lines of shape `(n, columns)`
+
+        Returns:
+            np.ndarray: the features of shape `(n, columns * len(names))`
+        """
+
+        lines = np.asarray(lines, dtype=float)
+        length = len(lines)
+
+        if not length:
+            return np.empty((0, lines.shape[1] * len(self._names)))
+
+        if self._origin is None:
+            self._origin = lines[0]
+
+        segments = []
+        begin = 0
+
+        while begin < length:
+            end = begin + min(self._period - self._filled, length - begin)
+            segments.append(self._reduce_segment(lines[begin:end]))
+            begin = end
+
+        reduced = {
+            reduction: np.concatenate([
+                segment[reduction] for segment in segments
+            ])
+            for reduction in self._reductions
+        }
+
+        # The number of lines of each window,
+        # which is less than `period` at the beginning of the stream
+        counts = np.minimum(
+            np.arange(self._seen, self._seen + length) + 1,
+            self._period
+        )[:, np.newaxis]
+
+        features = []
+
+        for name in self._names:
+            if name == 'mean':
+                feature = reduced['sum'] / counts + self._origin
+            elif name == 'std':
+                mean = reduced['sum'] / counts
+                feature = np.sqrt(
+                    np.maximum(reduced['sumsq'] / counts - mean * mean, 0)
+                )
+            elif name == 'return':
+                previous = np.concatenate((
+                    lines[:1] if self._last is None else self._last,
+                    lines[:-1]
+                ))
+                feature = lines / previous - 1
+            else:
+                feature = reduced[name]
+
+            features.append(feature)
+
+        self._seen += length
+        self._last = lines[-1:]
+
+        return np.concatenate(features, axis=1)
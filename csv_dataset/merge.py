@@ -0,0 +1,248 @@
+from typing import (
+    List,
+    Optional,
+    Deque,
+    Union
+)
+from collections import deque
+
+import numpy as np
+
+from .reader import AbstractReader
+
+
+HOWS = ('asof', 'outer')
+CHUNK_SIZE = 1024
+
+
+class _Stream:
+    def __init__(
+        self,
+        reader: AbstractReader,
+        key: int
+    ):
+        self.reader = reader
+        self.key = key
+
+    def reset(self) -> None:
+        self.reader.reset()
+        self.exhausted = False
+
+        # The rows read but not merged, which always starts with the last
+        # merged row (or a NaN row with key -inf), so that each key could be
+        # forward-filled by the row at or before it
+        self.rows: Optional[np.ndarray] = None
+
+        columns = self.reader.columns
+
+        if columns is not None:
+            # So that an empty reader could be merged as NaN columns
+            self._init_rows(columns)
+
+    def _init_rows(self, columns: int) -> None:
+        self.rows = np.full((1, columns), np.nan)
+        self.rows[0, self.key] = - np.inf
+
+    @property
+    def keys(self) -> np.ndarray:
+        return self.rows[:, self.key]
+
+    @property
+    def pending(self) -> bool:
+        return len(self.rows) > 1
+
+    def read(self, chunk_size: int) -> None:
+        chunk = self.reader.readlines(chunk_size)
+
+        if len(chunk) < chunk_size:
+            self.exhausted = True
+
+        if not len(chunk):
+            return
+
+        chunk = np.array(chunk, dtype=float)
+
+        if self.rows is None:
+            self._init_rows(chunk.shape[1])
+
+        self.rows = np.concatenate((self.rows, chunk))
+
+    def drop_before(self, key: float) -> None:
+        """Drops the rows before the last row at or before `key`, which could never be merged
+        """
+
+        cut = np.searchsorted(self.keys, key, side='right')
+
+        if cut > 1:
+            self.rows = self.rows[cut - 1:]
+
+    def values(self) -> np.ndarray:
+        """The columns except the key column
+        """
+
+        return np.delete(self.rows, self.key, axis=1)
+
+
+class MergeReader(AbstractReader[float]):
+    """Merges the lines of several readers which are sorted by their key columns in ascending order, and reads joined lines of `[key, *columns_of_reader_0, *columns_of_reader_1, ...]` in which the key columns of the readers are excluded.
+
+    The readers are read chunk by chunk, so the memory does not depend on the sizes of the files.
+
+    Args:
+        readers (List[AbstractReader]): the readers to merge
+        key (int | List[int]): the index of the key column (in the lines of each reader)
+        how (:obj:`str`, optional):
+            - 'asof': reads a line for each line of the first reader, with the columns of other readers from their last lines at or before the key
+            - 'outer': reads a line for each distinct key of all readers, with the columns of each reader from its last line at or before the key
+        chunk_size (:obj:`int`, optional): how many lines to read from a reader at a time
+    """
+
+    dtype = float
+
+    def __init__(
+        self,
+        readers: List[AbstractReader],
+        key: Union[int, List[int]],
+        how: str = 'asof',
+        chunk_size: int = CHUNK_SIZE,
+        max_lines: Optional[int] = None
+    ):
+        if not readers:
+            raise ValueError('readers must not be empty')
+
+        if how not in HOWS:
+            raise ValueError(f'how must be one of {HOWS}, but got `{how}`')
+
+        if isinstance(key, int):
+            key = [key] * len(readers)
+        elif len(key) != len(readers):
+            raise ValueError(
+                f'key has different length with readers, expect {len(readers)} but got {len(key)}'
+            )
+
+        self._streams = [
+            _Stream(reader, reader_key)
+            for reader, reader_key in zip(readers, key)
+        ]
+        self._how = how
+        self._chunk_size = chunk_size
+
+        self.max_lines = max_lines
+
+        self.reset()
+
+    @property
+    def lines(self) -> int:
+        """How many merged lines the reader has read
+        """
+
+        return self._lines
+
+    def reset(self) -> None:
+        self._lines = 0
+        self._merged: Deque[List[float]] = deque()
+
+        for i, stream in enumerate(self._streams):
+            stream.reset()
+            stream.read(self._chunk_size)
+
+            if stream.rows is None:
+                # We could not know the number of columns
+                raise ValueError(
+                    f'readers[{i}] has no lines and its number of columns is unknown'
+                )
+
+    def _horizon(self) -> float:
+        """Lines whose keys are less than the horizon could be merged, because all readers have read beyond them
+        """
+
+        streams = self._streams[1:] if self._how == 'asof' else self._streams
+
+        return min(
+            (stream.keys[-1] for stream in streams if not stream.exhausted),
+            default=np.inf
+        )
+
+    def _merge(self, horizon: float) -> int:
+        """Merges the lines before the horizon, and returns the number of merged lines
+        """
+
+        if self._how == 'asof':
+            first = self._streams[0]
+            targets = first.keys[1:]
+        else:
+            targets = np.unique(np.concatenate([
+                stream.keys[1:] for stream in self._streams
+            ]))
+
+        targets = targets[targets < horizon]
+
+        if not len(targets):
+            return 0
+
+        columns = [targets[:, None]]
+
+        for i, stream in enumerate(self._streams):
+            values = stream.values()
+
+            if i == 0 and self._how == 'asof':
+                columns.append(values[1:len(targets) + 1])
+            else:
+                columns.append(values[
+                    np.searchsorted(stream.keys, targets, side='right') - 1
+                ])
+
+        self._merged.extend(np.concatenate(columns, axis=1).tolist())
+
+        for stream in self._streams:
+            cut = np.searchsorted(stream.keys, targets[-1], side='right')
+            # Keeps the last row at or before the last merged key
+            stream.rows = stream.rows[cut - 1:]
+
+        return len(targets)
+
+    def _read_more(self) -> bool:
+        """Reads a chunk from the reader which blocks merging
+        """
+
+        first = self._streams[0]
+
+        if self._how == 'asof':
+            if not first.pending:
+                if first.exhausted:
+                    return False
+
+                first.read(self._chunk_size)
+                return True
+
+            streams = self._streams[1:]
+        else:
+            streams = self._streams
+
+        streams = [stream for stream in streams if not stream.exhausted]
+
+        if not streams:
+            return False
+
+        stream = min(streams, key=lambda stream: stream.keys[-1])
+        stream.read(self._chunk_size)
+
+        if self._how == 'asof':
+            # The rows of a reader whose keys trail the first reader
+            # are dropped as soon as they are read,
+            # so that the memory is bounded by the chunk size
+            stream.drop_before(first.keys[1])
+
+        return True
+
+    def readline(self) -> Optional[List[float]]:
+        if self._lines == self._max_lines:
+            return
+
+        while not self._merged:
+            if not self._merge(self._horizon()) and not self._read_more():
+                return
+
+        self._lines += 1
+
+        return self._merged.popleft()
@@ -0,0 +1,154 @@
+from typing import (
+    List,
+    Union
+)
+
+import numpy as np
+
+
+# - 'drop': drops the whole line
+# - 'nan': keeps the cell as NaN
+# - 'ffill': fills the cell with the last valid value of the column
+# - 'interpolate': linearly interpolates the cell between the last and the
+#   next valid values of the column
+# - a number: fills the cell with the number
+MISSING_STRATEGIES = ('drop', 'nan', 'ffill', 'interpolate')
+
+Strategy = Union[str, float]
+
+
+def check_strategy(strategy: Strategy) -> None:
+    if isinstance(strategy, str):
+        if strategy not in MISSING_STRATEGIES:
+            raise ValueError(
+                f'missing strategy must be a number or one of {MISSING_STRATEGIES}, but got `{strategy}`'
+            )
+
+        return
+
+    float(strategy)
+
+
+class MissingFiller:
+    """Fills the missing cells (NaN) of blocks of lines column by column.
+
+    Each column is filled in a vectorized way, and the last valid value of each column is kept across blocks, so that forward-filling and interpolation continue from the previous block.
+
+    The cells after the last valid value of a block could not be interpolated until the next valid value is read, so they are forward-filled.
+
+    Args:
+        strategies (List[Strategy]): the strategy of each column
+    """
+
+    def __init__(self, strategies: List[Strategy]):
+        for strategy in strategies:
+            check_strategy(strategy)
+
+        self._strategies = strategies
+
+        self.reset()
+
+    def reset(self) -> None:
+        columns = len(self._strategies)
+
+        self.filled = [0] * columns
+
+        # The last valid value of each column
+        self._last = np.full(columns, np.nan)
+        # The number of lines after the last valid value of each column
+        self._gap = np.zeros(columns, dtype=int)
+
+    def drop(self, block: np.ndarray) -> np.ndarray:
+        """Drops the lines which have missing cells in 'drop' columns
+        """
+
+        columns = [
+            i for i, strategy in enumerate(self._strategies)
+            if strategy == 'drop'
+        ]
+
+        if not columns:
+            return block
+
+        return block[~np.isnan(block[:, columns]).any(axis=1)]
+
+    def _ffill(
+        self,
+        values: np.ndarray,
+        missing: np.ndarray,
+        last: float
+    ) -> np.ndarray:
+        indexes = np.where(missing, -1, np.arange(len(values)))
+        np.maximum.accumulate(indexes, out=indexes)
+
+        return np.where(indexes >= 0, values[indexes], last)
+
+    def _interpolate(
+        self,
+        values: np.ndarray,
+        missing: np.ndarray,
+        column: int
+    ) -> np.ndarray:
+        positions = np.flatnonzero(~missing)
+        anchors = values[positions]
+
+        if not np.isnan(self._last[column]):
+            positions = np.concatenate(
+                ([- self._gap[column] - 1], positions)
+            )
+            anchors = np.concatenate(([self._last[column]], anchors))
+
+        if not len(positions):
+            return values
+
+        targets = np.flatnonzero(missing)
+        result = values.copy()
+
+        result[targets] = np.interp(targets, positions, anchors)
+
+        # Cells before the first valid value could not be interpolated
+        result[targets[targets < positions[0]]] = np.nan
+
+        return result
+
+    def fill(self, block: np.ndarray) -> np.ndarray:
+        """Fills the missing cells of the block of shape `(n, columns)`
+        """
+
+        length = len(block)
+
+        if not length:
+            return block
+
+        missing = np.isnan(block)
+        filled = block.copy()
+
+        for column, strategy in enumerate(self._strategies):
+            column_missing = missing[:, column]
+            values = block[:, column]
+
+            if column_missing.any():
+                if strategy == 'ffill':
+                    filled[:, column] = self._ffill(
+                        values, column_missing, self._last[column]
+                    )
+                elif strategy == 'interpolate':
+                    filled[:, column] = self._interpolate(
+                        values, column_missing, column
+                    )
+                elif not isinstance(strategy, str):
+                    filled[column_missing, column] = strategy
+
+                self.filled[column] += int(
+                    np.count_nonzero(~np.isnan(filled[column_missing, column]))
+                )
+
+            valid = np.flatnonzero(~column_missing)
+
+            if len(valid):
+                self._last[column] = values[valid[-1]]
+                self._gap[column] = length - 1 - valid[-1]
+            else:
+                self._gap[column] += length
+
+        return filled
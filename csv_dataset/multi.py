@@ -0,0 +1,262 @@
+from typing import (
+    List,
+    Optional,
+    Tuple,
+    Generic
+)
+
+import numpy as np
+
+from .reader import AbstractReader
+from .dataset import (
+    WindowSpec,
+    T
+)
+from .common import max_lines_error
+
+
+class DatasetView(WindowSpec):
+    """The window and batch settings of a view of `MultiDataset`
+    """
+
+    def __init__(self, dataset: 'MultiDataset'):
+        super().__init__()
+
+        self._dataset = dataset
+
+    @property
+    def _buffer_read(self) -> bool:
+        return self._dataset._configured
+
+    def _ends(self, limit: int) -> np.ndarray:
+        """The end lines (exclusive) of the batches which end no later than `limit`
+        """
+
+        return np.arange(self._least, limit + 1, self._stride)
+
+
+class MultiDataset(Generic[T]):
+    """Reads the lines of `reader` once and produces batches of several views from the shared lines.
+
+    Each view produces the same batches as a `Dataset` with the same window and batch settings. The views are read in lockstep by lines: each read returns the batches of the views which end at the same line, and None for the other views.
+
+    Args:
+        reader (AbstractReader): the reader
+    """
+
+    def __init__(
+        self,
+        reader: AbstractReader[T]
+    ):
+        self._reader = reader
+        self._views: List[DatasetView] = []
+        self._configured = False
+
+        self.reset()
+
+    def view(self) -> DatasetView:
+        """Creates a new view whose window and batch could be defined
+        """
+
+        if self._configured:
+            raise RuntimeError('calling view() during reading is forbidden')
+
+        view = DatasetView(self)
+        self._views.append(view)
+
+        return view
+
+    def _configure(self) -> None:
+        if self._configured:
+            return
+
+        if not self._views:
+            raise RuntimeError('there is no view, call view() first')
+
+        self._configured = True
+        self.reset_buffer()
+
+    def reset(self) -> 'MultiDataset':
+        self._reader.reset()
+
+        # The index of the first line of the buffer
+        self._offset = 0
+        self._buffer: Optional[np.ndarray] = None
+
+        # The end line (exclusive) of the next batch of each view,
+        # or None if the view is exhausted
+        self._ends: List[Optional[int]] = []
+
+        if self._configured:
+            self.reset_buffer()
+
+        return self
+
+    def reset_buffer(self) -> None:
+        """Drops the lines in the buffer, so that the next batches of all views start from the next line of the reader
+        """
+
+        if self._buffer is not None:
+            self._offset += len(self._buffer)
+            self._buffer = None
+
+        if not self._configured:
+            # The windows of views might be not defined yet
+            return
+
+        self._ends = [
+            self._offset + view._least for view in self._views
+        ]
+
+    def lines_need(self, reads: int) -> int:
+        """Calculate how many lines of datum needed for reading `reads` times
+        """
+
+        self._configure()
+
+        # The `reads`-th batch of any view ends no later than this
+        limit = min(
+            view._least + (reads - 1) * view._stride
+            for view in self._views
+        )
+
+        return int(self._all_ends(limit)[reads - 1])
+
+    def max_reads(self, max_lines: Optional[int] = None) -> Optional[int]:
+        """How many reads does the current dataset afford
+        """
+
+        self._configure()
+
+        if max_lines is None:
+            max_lines = self._reader.max_lines
+
+            if max_lines is None:
+                return None
+        elif max_lines <= 0:
+            raise max_lines_error(max_lines)
+
+        return len(self._all_ends(max_lines))
+
+    def _all_ends(self, limit: int) -> np.ndarray:
+        return np.unique(np.concatenate([
+            view._ends(limit) for view in self._views
+        ]))
+
+    def _fill(self, end: int) -> int:
+        """Reads lines until the buffer reaches line `end`, and returns the end of the buffer
+        """
+
+        buffered = self._offset + (
+            0 if self._buffer is None else len(self._buffer)
+        )
+
+        if end <= buffered:
+            return buffered
+
+        lines = self._reader.readlines(end - buffered)
+
+        if not len(lines):
+            return buffered
+
+        lines = np.asarray(lines)
+
+        self._buffer = lines if self._buffer is None else np.concatenate(
+            (self._buffer, lines)
+        )
+
+        return buffered + len(lines)
+
+    def get(self) -> Optional[Tuple[Optional[np.ndarray], ...]]:
+        """Gets the data of the next batches which end at the same line
+
+        Returns:
+            Optional[Tuple[Optional[np.ndarray], ...]]: the batches in the order of the views, in which the views without a batch ending at the line are None. None if all views are exhausted.
+        """
+
+        self._configure()
+
+        while True:
+            ends = [end for end in self._ends if end is not None]
+
+            if not ends:
+                return
+
+            end = min(ends)
+            buffered = self._fill(end)
+
+            if buffered >= end:
+                break
+
+            # Reaches EOF, the views which need more lines are exhausted
+            self._ends = [
+                None if view_end is None or view_end > buffered else view_end
+                for view_end in self._ends
+            ]
+
+        batches = []
+
+        for i, view in enumerate(self._views):
+            if self._ends[i] != end:
+                batches.append(None)
+                continue
+
+            start = end - view._least - self._offset
+            batches.append(
+                view._window_and_batch(self._buffer[start:start + view._least])
+            )
+
+            self._ends[i] += view._stride
+
+        # Drops the lines which will never be used
+        start = min(
+            (
+                view_end - view._least
+                for view_end, view in zip(self._ends, self._views)
+                if view_end is not None
+            ),
+            default=end
+        )
+
+        # The lines between batches with large strides are not read yet
+        drop = min(start - self._offset, len(self._buffer))
+
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._offset += drop
+
+        return tuple(batches)
+
+    def read(
+        self,
+        amount: int,
+        reset_buffer: bool = False
+    ) -> list:
+        """Reads multiple batches of data
+
+        Args:
+            amount (int): number of batches to be read
+            reset_buffer (:obj:`bool`, optional): if `True`, the dataset will reset the data of the previous window in the buffer
+        """
+
+        if reset_buffer:
+            self.reset_buffer()
+
+        array = []
+
+        while amount > 0:
+            amount -= 1
+            array.append(self.get())
+
+        return array
+
+    def __iter__(self) -> 'MultiDataset':
+        return self
+
+    def __next__(self) -> Tuple[Optional[np.ndarray], ...]:
+        got = self.get()
+
+        if got is None:
+            raise StopIteration
+
+        return got
@@ -0,0 +1,414 @@
+from typing import (
+    Callable,
+    Deque,
+    List,
+    Optional,
+    Tuple
+)
+from collections import deque
+from multiprocessing import shared_memory
+import multiprocessing
+import queue
+import traceback
+
+import numpy as np
+
+from .dataset import Dataset
+
+
+# Creates the dataset of the worker by (worker_index, workers)
+DatasetFactory = Callable[[int, int], Dataset]
+
+TIMEOUT = 1.
+
+# (slot, size, mask)
+Batch = Tuple[int, Optional[int], Optional[np.ndarray]]
+
+
+def _work(
+    factory: DatasetFactory,
+    index: int,
+    workers: int,
+    name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    skip: int,
+    free,
+    results
+) -> None:
+    shm = shared_memory.SharedMemory(name=name)
+    ring = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    try:
+        dataset = factory(index, workers)
+
+        # Skip the batches which have been delivered before restarting
+        for _ in range(skip):
+            dataset.get()
+
+        while True:
+            got = dataset.get()
+
+            if got is None:
+                results.put(('done', index, None))
+                return
+
+            slot = free.get()
+
+            if slot is None:
+                # Shutdown
+                return
+
+            # The last batch of the 'partial' remainder has fewer windows
+            size = None if got.shape == shape[1:] else len(got)
+            ring[slot, :len(got)] = got
+
+            # The mask is only sent if there are padded lines
+            mask = dataset.mask
+            mask = None if mask.all() else mask
+
+            results.put(('batch', index, (slot, size, mask)))
+    except Exception:
+        results.put(('error', index, traceback.format_exc()))
+    finally:
+        del ring
+        shm.close()
+
+
+class _Worker:
+    def __init__(self, index: int):
+        self.index = index
+        self.restarts = 0
+        # The number of batches which the consumer has received
+        self.delivered = 0
+        self.done = False
+
+        # The (slot, size, mask) of the received batches
+        # which have not been consumed
+        self.pending: Deque[Batch] = deque()
+
+        self.process = None
+        self.free = None
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.ring: Optional[np.ndarray] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.done and not self.pending
+
+
+class ParallelDataset:
+    """Produces batches by several worker processes, which each reads its own part of data, and transports batches via shared memory.
+
+    It should be closed by `close()` or used as a context manager, otherwise the workers and the shared memory are only released when it is garbage collected.
+
+    Args:
+        factory (Callable[[int, int], Dataset]): a picklable function which receives `(worker_index, workers)` and creates the dataset of the worker
+        workers (:obj:`int`, optional): the number of worker processes
+        slots (:obj:`int`, optional): the number of preallocated batch slots of each worker
+        ordered (:obj:`bool`, optional): if `True`, gets batches from the workers in turn, otherwise gets batches as soon as they are ready
+        restarts (:obj:`int`, optional): the max number of times to restart each failed worker
+        context (:obj:`str`, optional): the multiprocessing start method
+    """
+
+    def __init__(
+        self,
+        factory: DatasetFactory,
+        workers: int = 2,
+        slots: int = 4,
+        ordered: bool = True,
+        restarts: int = 3,
+        context: Optional[str] = None
+    ):
+        if workers <= 0:
+            raise ValueError(f'workers must be positive, but got `{workers}`')
+
+        if slots <= 0:
+            raise ValueError(f'slots must be positive, but got `{slots}`')
+
+        self._factory = factory
+        self._workers_count = workers
+        self._slots = slots
+        self._ordered = ordered
+        self._restarts = restarts
+        self._context = multiprocessing.get_context(context)
+
+        self._workers: List[_Worker] = []
+        self._started = False
+
+        self._mask: Optional[np.ndarray] = None
+        self._batch_shape: Optional[Tuple[int, ...]] = None
+
+    @property
+    def mask(self) -> Optional[np.ndarray]:
+        """The boolean mask of the last batch read by `get()`, see `Dataset.mask`
+        """
+
+        if self._mask is None and self._batch_shape is not None:
+            return np.ones(self._batch_shape[:-1], dtype=bool)
+
+        return self._mask
+
+    def _probe(self) -> Optional[Tuple[Tuple[int, ...], str]]:
+        """Gets the first batch to know the shape and dtype of batches
+        """
+
+        for index in range(self._workers_count):
+            dataset = self._factory(index, self._workers_count)
+            got = dataset.get()
+
+            if got is None:
+                continue
+
+            shape = got.shape
+            batch = dataset._batch
+
+            if batch > 1 and len(got) < batch:
+                # The 'partial' remainder
+                shape = (batch,) + shape[1:]
+
+            return shape, got.dtype.str
+
+    def _start(self) -> bool:
+        self._started = True
+
+        probe = self._probe()
+
+        if probe is None:
+            # There is no data at all
+            return False
+
+        shape, self._dtype = probe
+        self._shape = (self._slots,) + shape
+
+        self._results = self._context.Queue()
+        self._turn = 0
+        self._held: Optional[Tuple[_Worker, int]] = None
+
+        for index in range(self._workers_count):
+            worker = _Worker(index)
+            worker.shm = shared_memory.SharedMemory(
+                create=True,
+                size=max(
+                    1,
+                    int(np.prod(self._shape)) * np.dtype(self._dtype).itemsize
+                )
+            )
+            worker.ring = np.ndarray(
+                self._shape,
+                dtype=self._dtype,
+                buffer=worker.shm.buf
+            )
+
+            self._workers.append(worker)
+            self._spawn(worker, range(self._slots))
+
+        return True
+
+    def _spawn(self, worker: _Worker, slots) -> None:
+        worker.free = self._context.Queue()
+
+        for slot in slots:
+            worker.free.put(slot)
+
+        worker.process = self._context.Process(
+            target=_work,
+            args=(
+                self._factory,
+                worker.index,
+                self._workers_count,
+                worker.shm.name,
+                self._shape,
+                self._dtype,
+                worker.delivered,
+                worker.free,
+                self._results
+            ),
+            daemon=True
+        )
+        worker.process.start()
+
+    def _restart(self, worker: _Worker, reason: str) -> None:
+        if worker.restarts >= self._restarts:
+            self.close()
+            raise RuntimeError(
+                f'worker {worker.index} failed too many times:\n{reason}'
+            )
+
+        worker.restarts += 1
+
+        # The worker might be still flushing messages before exiting
+        worker.process.join(TIMEOUT)
+
+        if worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join()
+
+        used = {slot for slot, _, _ in worker.pending}
+
+        if self._held is not None and self._held[0] is worker:
+            used.add(self._held[1])
+
+        self._spawn(
+            worker,
+            [slot for slot in range(self._slots) if slot not in used]
+        )
+
+    def _handle(self, message: Tuple[str, int, object]) -> None:
+        kind, index, value = message
+        worker = self._workers[index]
+
+        if kind == 'batch':
+            worker.pending.append(value)
+            worker.delivered += 1
+        elif kind == 'done':
+            worker.done = True
+        else:
+            self._restart(worker, value)
+
+    def _receive(self) -> None:
+        try:
+            self._handle(self._results.get(timeout=TIMEOUT))
+            return
+        except queue.Empty:
+            pass
+
+        # Handle the messages sent right before the workers exit
+        while True:
+            try:
+                self._handle(self._results.get_nowait())
+            except queue.Empty:
+                break
+
+        for worker in self._workers:
+            if not worker.done and not worker.process.is_alive():
+                self._restart(
+                    worker,
+                    f'exited with code {worker.process.exitcode}'
+                )
+
+    def _release(self) -> None:
+        if self._held is None:
+            return
+
+        worker, slot = self._held
+        self._held = None
+
+        if not worker.done:
+            worker.free.put(slot)
+
+    def _next_worker(self) -> Optional[_Worker]:
+        count = self._workers_count
+
+        for i in range(count):
+            worker = self._workers[(self._turn + i) % count]
+
+            if not worker.exhausted:
+                return worker
+
+    def get(self) -> Optional[np.ndarray]:
+        """Gets the next batch.
+
+        The batch is a view of the shared memory, which is only valid until the next `get()`, `reset()` or `close()`
+        """
+
+        if not self._started and not self._start():
+            return
+
+        self._mask = None
+        self._batch_shape = None
+
+        if not self._workers:
+            return
+
+        self._release()
+
+        while True:
+            if self._ordered:
+                worker = self._next_worker()
+
+                if worker is None:
+                    return
+
+                candidates = [worker]
+            else:
+                candidates = [
+                    worker for worker in self._workers
+                    if not worker.exhausted
+                ]
+
+                if not candidates:
+                    return
+
+            for worker in candidates:
+                if worker.pending:
+                    slot, size, self._mask = worker.pending.popleft()
+                    self._held = (worker, slot)
+                    self._turn = (worker.index + 1) % self._workers_count
+
+                    batch = worker.ring[slot]
+
+                    if size is not None:
+                        batch = batch[:size]
+
+                    self._batch_shape = batch.shape
+
+                    return batch
+
+            self._receive()
+
+    def close(self) -> None:
+        """Stops all workers and releases the shared memory
+        """
+
+        for worker in self._workers:
+            if worker.process.is_alive():
+                worker.free.put(None)
+
+        for worker in self._workers:
+            worker.process.join(TIMEOUT)
+
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join()
+
+            worker.ring = None
+
+            try:
+                worker.shm.close()
+            except BufferError:
+                # Some batches are still referenced,
+                # the memory will be unmapped after they are released
+                pass
+
+            worker.shm.unlink()
+
+        self._workers = []
+        self._started = False
+
+    def reset(self) -> 'ParallelDataset':
+        self.close()
+
+        return self
+
+    def __enter__(self) -> 'ParallelDataset':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        # Releases the shared memory if the dataset is not closed
+        if getattr(self, '_workers', None):
+            self.close()
+
+    def __iter__(self) -> 'ParallelDataset':
+        return self
+
+    def __next__(self) -> np.ndarray:
+        got = self.get()
+
+        if got is None:
+            raise StopIteration
+
+        return got
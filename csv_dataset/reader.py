@@ -1,26 +1,76 @@
 from typing import (
     List,
+    Sequence,
     Generic,
     TypeVar,
     Type,
     Optional,
-    TextIO
+    Tuple,
+    Callable,
+    Deque,
+    Union
 )
 from abc import (
     ABC,
     abstractmethod
 )
+from bisect import bisect_left
+from collections import deque
+import copy
+import csv
+import os
 
+import numpy as np
 from common_decorators import lazy
 
 from .normalizer import NormalizerProtocol
 from .common import max_lines_error
+from .source import (
+    AbstractSource,
+    open_source
+)
+from .missing import (
+    MissingFiller,
+    Strategy
+)
+from .cache import (
+    ParsedCache,
+    default_cache
+)
 
 
 SPLITTER = ','
+QUOTECHAR = '"'
+
+# If the byte range to search is no larger than the block size,
+# `CsvReader` stops bisecting and scans the lines of the block
+INDEX_BLOCK_SIZE = 64 * 1024
+COUNT_BLOCK_SIZE = 1024 * 1024
+TAIL_BLOCK_SIZE = 64 * 1024
+# How many lines to fill missing cells at a time
+MISSING_CHUNK_SIZE = 1024
+# The max number of following lines which a quoted field could span,
+# otherwise the quote is considered stray
+MAX_QUOTED_LINES = 64
 T = TypeVar('T', float, int)
 
 
+def _normalizer_key(normalizer: NormalizerProtocol) -> object:
+    """Gets the settings of a normalizer, or the normalizer itself if its settings are not hashable
+    """
+
+    try:
+        key = (
+            type(normalizer).__module__,
+            type(normalizer).__qualname__,
+            tuple(sorted(vars(normalizer).items()))
+        )
+        hash(key)
+        return key
+    except TypeError:
+        return normalizer
+
+
 class AbstractReader(ABC, Generic[T]):
     dtype: Type[T]
 
@@ -63,6 +113,46 @@ class AbstractReader(ABC, Generic[T]):
         """
         ...  # pragma: no cover
 
+    @property
+    def columns(self) -> Optional[int]:
+        """The number of columns of each line, or None if it is unknown before reading
+        """
+
+        return None
+
+    @property
+    def array(self) -> Optional[np.ndarray]:
+        """The in-memory 2-D array whose consecutive rows are the lines of the reader, or None if there is no such array.
+
+        If it is not None, the next line to read should be `array[reader.offset]`, and `Dataset` builds batches as views of the array directly.
+        """
+
+        return None
+
+    def tail(self, lines: int) -> None:
+        """Moves the reader to the start of the last `lines` lines
+        """
+
+        raise NotImplementedError(
+            f'{type(self).__name__} does not support tail()'
+        )
+
+    def readlines(self, lines: int) -> Sequence[List[T]]:
+        """Reads at most `lines` lines, fewer lines are returned only if it reaches EOF
+        """
+
+        read = []
+
+        while len(read) < lines:
+            line = self.readline()
+
+            if line is None:
+                break
+
+            read.append(line)
+
+        return read
+
 
 class CsvReader(AbstractReader[T]):
     def __init__(
@@ -73,15 +163,38 @@ class CsvReader(AbstractReader[T]):
         header: bool = False,
         splitter: str = SPLITTER,
         normalizers: List[NormalizerProtocol] = [],
-        max_lines: Optional[int] = None
+        max_lines: Optional[int] = None,
+        key_column: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        source: Callable[[str], AbstractSource] = open_source,
+        quotechar: Optional[str] = QUOTECHAR,
+        missing: Union[Strategy, List[Strategy]] = 'drop',
+        cache: Union[bool, ParsedCache] = False
     ):
         self.dtype = dtype
-        self._splitter = splitter
+        self._delimiter = splitter
+        self._splitter = splitter.encode()
+        self._quotechar = quotechar
+        self._quote = quotechar.encode() if quotechar else None
         self._indexes = indexes
+        # The indexes of the columns in the order of the columns of the file
+        self._columns = sorted(set(indexes))
         self._filepath = filepath
+        self._source_factory = source
         self._normalizers = normalizers
         self._header = header
 
+        self._key_column = key_column
+        self._start = start
+        self._end = end
+
+        # A sparse index of (byte offset, key) of the lines that have been
+        # probed, which is sorted since the csv file is sorted by the key
+        self._index: List[Tuple[int, float]] = []
+        # The size of the file when the byte offsets were computed
+        self._known_size: Optional[int] = None
+
         self.max_lines = max_lines
 
         if normalizers and len(normalizers) != len(indexes):
@@ -89,8 +202,90 @@ class CsvReader(AbstractReader[T]):
                 f'normalizers has different length with indexes, expect {len(indexes)} but got {len(normalizers)}'
             )
 
+        if key_column is None and (start is not None or end is not None):
+            raise ValueError('start and end could only be used with key_column')
+
+        self._missing = tuple(missing) if isinstance(
+            missing, list
+        ) else missing
+        self._filler = self._create_filler(missing)
+
+        self._cache = default_cache if cache is True else (cache or None)
+        # The parsed lines from the cache
+        self._cached: Optional[np.ndarray] = None
+
         self.reset()
 
+    def _create_filler(
+        self,
+        missing: Union[Strategy, List[Strategy]]
+    ) -> Optional[MissingFiller]:
+        if not isinstance(missing, list):
+            missing = [missing] * len(self._columns)
+        elif len(missing) != len(self._columns):
+            raise ValueError(
+                f'missing has different length with indexes, expect {len(self._columns)} but got {len(missing)}'
+            )
+
+        if all(strategy == 'drop' for strategy in missing):
+            return
+
+        if self.dtype is int and (
+            'nan' in missing or 'interpolate' in missing
+        ):
+            raise ValueError(
+                'missing strategies "nan" and "interpolate" require dtype float'
+            )
+
+        return MissingFiller(missing)
+
+    @property
+    def filled(self) -> List[int]:
+        """How many missing cells of each column have been filled
+        """
+
+        if self._filler is None:
+            return [0] * len(self._columns)
+
+        return list(self._filler.filled)
+
+    @property
+    def columns(self) -> int:
+        return len(self._columns)
+
+    @property
+    def array(self) -> Optional[np.ndarray]:
+        return self._cached
+
+    @property
+    def offset(self) -> int:
+        """The index of the next line to read in `reader.array`
+        """
+
+        return self._offset
+
+    @property
+    def max_lines(self) -> Optional[int]:
+        if self._cached is not None:
+            lines = len(self._cached)
+
+            return lines if self._max_lines is None else min(
+                self._max_lines, lines
+            )
+
+        if self._key_column is None:
+            return self._max_lines
+
+        range_lines = self._range_records
+
+        return range_lines if self._max_lines is None else min(
+            self._max_lines, range_lines
+        )
+
+    @max_lines.setter
+    def max_lines(self, max_lines: Optional[int]) -> None:
+        self._set_max_lines(max_lines)
+
     @property
     def lines(self) -> int:
         """How many lines the reader has read
@@ -106,20 +301,410 @@ class CsvReader(AbstractReader[T]):
     #     return self._pos
 
     @lazy
-    def _fd(self) -> TextIO:
-        # Ref
-        # https://docs.python.org/3/library/io.html
-        return open(self._filepath, 'r')
+    def _source(self) -> AbstractSource:
+        return self._source_factory(self._filepath)
+
+    @lazy
+    def _data_start(self) -> int:
+        """The byte offset of the first data line
+        """
+
+        self._source.seek(0)
+
+        if self._header:
+            self._source.readline()
+
+        return self._source.tell()
+
+    def _probe(
+        self,
+        offset: int,
+        index: bool = True
+    ) -> Tuple[int, Optional[float]]:
+        """Gets the byte offset and the key of the first line which starts at or after `offset`
+
+        Returns:
+            Tuple[int, Optional[float]]: the key is None if it reaches EOF
+        """
+
+        source = self._source
+
+        if offset > self._data_start:
+            # Skip the rest of the line which contains byte `offset - 1`,
+            # so that we will not skip the line starting at `offset`
+            source.seek(offset - 1)
+            source.readline()
+        else:
+            source.seek(self._data_start)
+
+        while True:
+            line_start = source.tell()
+            line = source.readline()
+
+            if not line:
+                return line_start, None
+
+            try:
+                key = float(self._split(line)[self._key_column])
+            except (ValueError, IndexError):
+                # Skip lines with invalid keys
+                continue
+
+            if index:
+                position = bisect_left(self._index, (line_start,))
+
+                probed = position < len(self._index) \
+                    and self._index[position][0] == line_start
+
+                if not probed:
+                    self._index.insert(position, (line_start, key))
+
+            return line_start, key
+
+    def _seek_key(self, key: float) -> int:
+        """Gets the byte offset of the first line whose key is no less than `key`
+        """
+
+        low = self._data_start
+        high = self._source.size
+
+        # Narrow the range with the lines probed before
+        for offset, probed_key in self._index:
+            if probed_key < key:
+                low = max(low, offset + 1)
+            else:
+                high = min(high, offset)
+                break
+
+        while high - low > INDEX_BLOCK_SIZE:
+            mid = (low + high) // 2
+            line_start, probed_key = self._probe(mid)
+
+            if probed_key is None or probed_key >= key:
+                high = mid
+            else:
+                low = line_start + 1
+
+        # Scan the lines within the block
+        line_start, probed_key = self._probe(low)
+
+        while probed_key is not None and probed_key < key:
+            line_start, probed_key = self._probe(line_start + 1, False)
+
+        return line_start
+
+    @lazy
+    def _range_bounds(self) -> Tuple[int, Optional[int]]:
+        """The byte offsets where the key range starts and ends, the end is None if the range is open-ended
+        """
+
+        start = self._data_start if self._start is None else self._seek_key(
+            self._start
+        )
+
+        if self._end is None:
+            return start, None
+
+        return start, max(start, self._seek_key(self._end))
+
+    @lazy
+    def _range(self) -> Tuple[int, int]:
+        """The byte offset where the key range starts and the number of raw lines within the key range, including blank and invalid lines
+        """
+
+        start, end = self._range_bounds
+
+        if end is None:
+            end = self._source.size
+
+        source = self._source
+        source.seek(start)
+
+        lines = 0
+        rest = end - start
+        last = b'\n'
+
+        while rest > 0:
+            block = source.read(min(rest, COUNT_BLOCK_SIZE))
+
+            if not block:
+                break
+
+            lines += block.count(b'\n')
+            last = block[-1:]
+            rest -= len(block)
+
+        if last != b'\n':
+            # The last line has no trailing newline
+            lines += 1
+
+        return start, lines
+
+    @lazy
+    def _range_records(self) -> int:
+        """The number of valid records within the key range, which excludes the blank, invalid and dropped lines
+        """
+
+        source = self._source
+        position = source.tell()
+        state = (
+            self._range_lines,
+            self._filled_lines,
+            self._exhausted,
+            self._filler
+        )
+
+        # Counts with a copy of the filler to keep the reading state
+        self._filler = copy.deepcopy(self._filler)
+        self._reset_stream()
+
+        next_line = self._next if self._filler is None else self._next_filled
+        records = 0
+
+        while next_line() is not None:
+            records += 1
+
+        (
+            self._range_lines,
+            self._filled_lines,
+            self._exhausted,
+            self._filler
+        ) = state
+        source.seek(position)
+
+        return records
+
+    def _reset_filled(self) -> None:
+        self._filled_lines: Deque[List[T]] = deque()
+        self._exhausted = False
+
+        if self._filler is not None:
+            self._filler.reset()
+
+    def _reset_stream(self) -> None:
+        self._reset_filled()
+
+        if self._key_column is None:
+            offset, self._range_lines = self._data_start, None
+        elif self._end is None:
+            # An open-ended range is read to EOF,
+            # so that appended lines could be read
+            offset, self._range_lines = self._range_bounds[0], None
+        else:
+            offset, self._range_lines = self._range
+
+        self._source.seek(offset)
+
+    def _reopen(self) -> None:
+        """Opens the file at the path again if the file has been replaced
+        """
+
+        st = os.stat(self._filepath)
+        opened = self._source.stat()
+
+        if (st.st_dev, st.st_ino) == (opened.st_dev, opened.st_ino):
+            return
+
+        self._source.close()
+        self.__dict__.pop('_source', None)
+
+        self._clear_offsets()
+
+    def _clear_offsets(self) -> None:
+        """Drops the byte offsets computed from the content of the file
+        """
+
+        for name in (
+            '_data_start',
+            '_range_bounds',
+            '_range',
+            '_range_records'
+        ):
+            self.__dict__.pop(name, None)
+
+        self._index = []
+        self._known_size = None
+
+    def _refresh(self) -> None:
+        """Drops the byte offsets if the file has been truncated, e.g. rewritten in place, or if the header had not been completely written when they were computed.
+
+        If the file has grown, the key range is located and counted again.
+        """
+
+        size = self._source.size
+        known = self._known_size
+        self._known_size = size
+
+        if known is None or size == known:
+            return
+
+        # The header had not been completely written
+        incomplete = self._header and self.__dict__.get(
+            '_data_start', 0
+        ) >= known
+
+        if size < known or incomplete:
+            self._clear_offsets()
+            self._known_size = size
+            return
+
+        # Appended lines might be within the key range
+        for name in ('_range_bounds', '_range', '_range_records'):
+            self.__dict__.pop(name, None)
+
+    def _cache_key(self) -> tuple:
+        """The identity of the opened file and the settings which affect the parsed lines
+        """
+
+        st = self._source.stat()
+
+        return (
+            os.path.realpath(self._filepath),
+            st.st_dev,
+            st.st_ino,
+            st.st_size,
+            st.st_mtime_ns,
+            tuple(self._indexes),
+            self.dtype,
+            self._header,
+            self._delimiter,
+            self._quotechar,
+            self._missing,
+            self._key_column,
+            self._start,
+            self._end,
+            tuple(
+                _normalizer_key(normalizer)
+                for normalizer in self._normalizers
+            )
+        )
+
+    def _parse_all(self, max_bytes: int) -> Optional[np.ndarray]:
+        """Parses and normalizes all lines of the file (or the key range), returns None if the lines are larger than `max_bytes`
+        """
+
+        self._reset_stream()
+
+        next_line = self._next if self._filler is None else self._next_filled
+        dtype = float if self._normalizers else self.dtype
+        max_lines = max_bytes // (
+            np.dtype(dtype).itemsize * max(1, len(self._columns))
+        )
+        lines = []
+
+        while True:
+            line = next_line()
+
+            if line is None:
+                break
+
+            if len(lines) == max_lines:
+                return
+
+            lines.append(self._normalize(line))
+
+        if not lines:
+            return np.empty((0, len(self._columns)), dtype=dtype)
+
+        return np.array(lines, dtype=dtype)
 
     def reset(self) -> None:
         self._lines = 0
-        self._fd.seek(0)
+        self._offset = 0
 
-        if self._header:
-            self._readline()
+        if self._cache is None:
+            self._refresh()
+            self._reset_stream()
+            return
+
+        # Re-checks the file every time,
+        # so that a modified file will not hit the stale lines
+        self._reopen()
+        self._refresh()
+        self._cached = None
+        self._cached = self._cache.get_or_parse(
+            self._cache_key(),
+            self._parse_all
+        )
+
+        if self._cached is None:
+            # The file is too large to be cached
+            self._reset_stream()
+
+    def _read_raw(self) -> bytes:
+        if self._range_lines is not None:
+            if not self._range_lines:
+                # Reaches the end of the key range
+                return b''
+
+            self._range_lines -= 1
+
+        return self._source.readline()
+
+    def _readline(self) -> bytes:
+        """Reads a record, which might span several lines if it contains quoted newlines
+        """
+
+        line = self._read_raw()
 
-    def _readline(self) -> str:
-        return self._fd.readline().strip()
+        quote = self._quote
+
+        if quote is not None and quote in line and line.count(quote) % 2:
+            # A record with an odd number of quotes continues in the next line
+            line = self._join_quoted(line)
+
+        return line.strip()
+
+    def _join_quoted(self, line: bytes) -> bytes:
+        """Joins the following lines of a record which contains quoted newlines.
+
+        If the quote is not closed within `MAX_QUOTED_LINES` lines, or the joined record is malformed, the quote is considered stray, and the reader resyncs at the next line.
+        """
+
+        source = self._source
+        position = source.tell()
+        range_lines = self._range_lines
+
+        record = line
+        quotes = line.count(self._quote)
+
+        for _ in range(MAX_QUOTED_LINES):
+            rest = self._read_raw()
+
+            if not rest:
+                break
+
+            record += rest
+            quotes += rest.count(self._quote)
+
+            if not quotes % 2:
+                try:
+                    self._split(record.strip())
+                    return record
+                except ValueError:
+                    break
+
+        source.seek(position)
+        self._range_lines = range_lines
+
+        return line
+
+    def _split(self, line: bytes) -> list:
+        """Splits the cells of `line`, raises ValueError if the line is malformed
+        """
+
+        if self._quote is None or self._quote not in line:
+            # Fast path
+            return line.split(self._splitter)
+
+        try:
+            return next(csv.reader(
+                [line.decode()],
+                delimiter=self._delimiter,
+                quotechar=self._quotechar
+            ))
+        except csv.Error as e:
+            raise ValueError(f'malformed line: {e}') from e
 
     def _normalize(
         self,
@@ -133,27 +718,218 @@ class CsvReader(AbstractReader[T]):
             for i, datum in enumerate(data)
         ]
 
-    def readline(self) -> Optional[List[T]]:
-        if self._lines == self._max_lines:
-            return
-
-        line = self._readline()
-        # self._pos = self._fd.tell()
-
-        if not line:
-            return
-
-        splitted = line.split(self._splitter)
+    def _parse(self, line: bytes) -> Optional[List[T]]:
+        """Parses the cells of `line`, returns None if the line is invalid
+        """
 
         try:
-            line = [
+            splitted = self._split(line)
+
+            return [
                 self.dtype(cell)
                 for i, cell in enumerate(splitted)
                 if i in self._indexes
             ]
         except ValueError:
-            return self.readline()
+            return
+
+    def _parse_cells(self, line: bytes) -> List[float]:
+        """Parses the cells of `line`, invalid or absent cells are parsed as NaN
+        """
+
+        try:
+            splitted = self._split(line)
+        except ValueError:
+            splitted = []
+
+        cells = []
+
+        for i in self._columns:
+            try:
+                cells.append(self.dtype(splitted[i]))
+            except (ValueError, IndexError):
+                cells.append(np.nan)
+
+        return cells
+
+    def _is_valid(self, line: bytes) -> bool:
+        if self._filler is None:
+            return self._parse(line) is not None
+
+        return len(self._filler.drop(np.array([self._parse_cells(line)]))) > 0
+
+    def _fill_chunk(self) -> None:
+        chunk = []
+
+        while len(chunk) < MISSING_CHUNK_SIZE:
+            line = self._readline()
+
+            if not line:
+                self._exhausted = True
+                break
+
+            chunk.append(self._parse_cells(line))
+
+        if not chunk:
+            return
+
+        block = self._filler.fill(
+            self._filler.drop(np.array(chunk, dtype=float))
+        )
+
+        if self.dtype is int:
+            # Integers could not be NaN
+            block = block[~np.isnan(block).any(axis=1)].astype(int)
+
+        self._filled_lines.extend(block.tolist())
+
+    def _next_filled(self) -> Optional[List[T]]:
+        while not self._filled_lines:
+            if self._exhausted:
+                return
+
+            self._fill_chunk()
+
+        return self._filled_lines.popleft()
+
+    def _next(self) -> Optional[List[T]]:
+        while True:
+            line = self._readline()
+            # self._pos = self._fd.tell()
+
+            if not line:
+                return
+
+            line = self._parse(line)
+
+            if line is not None:
+                return line
+
+    def _read_cached(self, lines: int) -> np.ndarray:
+        if self._max_lines is not None:
+            lines = min(lines, self._max_lines - self._lines)
+
+        end = min(self._offset + max(lines, 0), len(self._cached))
+        read = self._cached[self._offset:end]
+
+        self._lines += len(read)
+        self._offset = end
+
+        return read
+
+    def readlines(self, lines: int) -> Sequence[List[T]]:
+        if self._cached is not None:
+            return self._read_cached(lines)
+
+        return super().readlines(lines)
+
+    def readline(self) -> Optional[List[T]]:
+        if self._cached is not None:
+            lines = self._read_cached(1)
+
+            return lines[0].tolist() if len(lines) else None
+
+        if self._lines == self._max_lines:
+            return
+
+        line = self._next() if self._filler is None else self._next_filled()
+
+        if line is None:
+            return
 
         self._lines += 1
 
         return self._normalize(line)
+
+    def tail(self, lines: int) -> None:
+        """Moves the reader to the start of the last `lines` valid complete lines by scanning backwards from the end of the file, so that the cost does not depend on the file size.
+
+        The last line without a trailing newline is considered incomplete, which might be still being written.
+
+        With a key range, only the lines within the range are considered.
+
+        The cached lines are not used until the next `reset()`, since the file might have grown.
+        """
+
+        self._cached = None
+
+        source = self._source
+
+        if self._key_column is None:
+            data_start, block_end = self._data_start, None
+        else:
+            data_start, block_end = self._range_bounds
+
+        if block_end is None:
+            block_end = source.size
+
+        # The incomplete line at the beginning of the previous block
+        carry = b''
+        first_block = True
+
+        found = 0
+        scanned = 0
+        offset = None
+        # The number of lines from `offset` to the last complete line
+        range_lines = 0
+
+        while found < lines and block_end > data_start:
+            block_start = max(data_start, block_end - TAIL_BLOCK_SIZE)
+            source.seek(block_start)
+
+            parts = (
+                source.read(block_end - block_start) + carry
+            ).split(b'\n')
+
+            if first_block:
+                # Drop the incomplete last line
+                parts.pop()
+
+                if not parts:
+                    # The whole block is within the incomplete last line
+                    block_end = block_start
+                    continue
+
+                first_block = False
+
+            position = block_start
+            positions = []
+
+            for part in parts:
+                positions.append(position)
+                position += len(part) + 1
+
+            if block_start > data_start:
+                carry = parts[0]
+                begin = 1
+            else:
+                carry = b''
+                begin = 0
+
+            for i in range(len(parts) - 1, begin - 1, -1):
+                line = parts[i].strip()
+
+                if not line:
+                    # An empty line stops reading,
+                    # so lines before it could never be reached
+                    block_end = data_start
+                    break
+
+                scanned += 1
+
+                if self._is_valid(line):
+                    found += 1
+                    offset = positions[i]
+                    range_lines = scanned
+
+                    if found == lines:
+                        break
+            else:
+                block_end = block_start
+
+        self._lines = 0
+        self._range_lines = range_lines
+        self._reset_filled()
+
+        if offset is not None:
+            source.seek(offset)
@@ -0,0 +1,255 @@
+from typing import (
+    List,
+    Optional,
+    Deque,
+    Tuple,
+    Union
+)
+from collections import deque
+
+import numpy as np
+
+from .reader import (
+    AbstractReader,
+    T
+)
+
+
+AGGREGATIONS = ('open', 'high', 'low', 'close', 'sum', 'mean')
+CHUNK_SIZE = 1024
+
+# The aggregation of the column at the same position,
+# or a (column, aggregation) pair
+Aggregation = Union[str, Tuple[int, str]]
+
+
+def _to_pairs(aggregations: List[Aggregation]) -> List[Tuple[int, str]]:
+    if all(isinstance(aggregation, str) for aggregation in aggregations):
+        pairs = list(enumerate(aggregations))
+    elif any(isinstance(aggregation, str) for aggregation in aggregations):
+        raise ValueError(
+            'aggregations should be either the aggregation of each column or (column, aggregation) pairs, but not both'
+        )
+    else:
+        pairs = [(column, name) for column, name in aggregations]
+
+    if not pairs:
+        raise ValueError('aggregations must not be empty')
+
+    for _, name in pairs:
+        if name not in AGGREGATIONS:
+            raise ValueError(
+                f'aggregation must be one of {AGGREGATIONS}, but got `{name}`'
+            )
+
+    return pairs
+
+
+def _aggregate(
+    name: str,
+    block: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> np.ndarray:
+    if name == 'open':
+        return block[starts]
+
+    if name == 'close':
+        return block[ends - 1]
+
+    if name == 'high':
+        return np.maximum.reduceat(block, starts, axis=0)
+
+    if name == 'low':
+        return np.minimum.reduceat(block, starts, axis=0)
+
+    summed = np.add.reduceat(block, starts, axis=0)
+
+    if name == 'sum':
+        return summed
+
+    # mean
+    return summed / (ends - starts)[:, None]
+
+
+class ResampleReader(AbstractReader[T]):
+    """Groups consecutive lines of `reader` and reads one aggregated line per group
+
+    Args:
+        reader (AbstractReader): the underlying reader
+        aggregations (List[str] | List[Tuple[int, str]]): either the aggregation of each column of `reader`, or `(column, aggregation)` pairs so that a column could be aggregated several times. An aggregation is one of 'open', 'high', 'low', 'close', 'sum' and 'mean'
+        count (:obj:`int`, optional): groups every `count` lines
+        key (:obj:`int`, optional): the index of the column (in the lines of `reader`) to group by
+        interval (:obj:`float`, optional): if specified, groups the lines whose `key // interval` are the same, otherwise the lines whose keys are the same
+        chunk_size (:obj:`int`, optional): how many lines to aggregate at a time
+    """
+
+    def __init__(
+        self,
+        reader: AbstractReader[T],
+        aggregations: List[Aggregation],
+        count: Optional[int] = None,
+        key: Optional[int] = None,
+        interval: Optional[float] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_lines: Optional[int] = None
+    ):
+        if (count is None) == (key is None):
+            raise ValueError('either count or key should be specified')
+
+        if count is not None and count <= 0:
+            raise ValueError(f'count must be positive, but got `{count}`')
+
+        if interval is not None and key is None:
+            raise ValueError('interval could only be used with key')
+
+        self._per_column = all(
+            isinstance(aggregation, str) for aggregation in aggregations
+        )
+        self._aggregations = _to_pairs(aggregations)
+        self._reader = reader
+
+        if reader.columns is not None:
+            self._check_columns(reader.columns)
+        self._count = count
+        self._key = key
+        self._interval = interval
+        self._chunk_size = chunk_size
+
+        self.dtype = float if any(
+            name == 'mean' for _, name in self._aggregations
+        ) else reader.dtype
+        self.max_lines = max_lines
+
+        self.reset()
+
+    @property
+    def max_lines(self) -> Optional[int]:
+        if self._max_lines is not None:
+            return self._max_lines
+
+        if self._count is None:
+            # We could not know how many groups there are
+            # before reading all lines
+            return None
+
+        max_lines = self._reader.max_lines
+
+        return None if max_lines is None else - (- max_lines // self._count)
+
+    @max_lines.setter
+    def max_lines(self, max_lines: Optional[int]) -> None:
+        self._set_max_lines(max_lines)
+
+    @property
+    def columns(self) -> int:
+        return len(self._aggregations)
+
+    def _check_columns(self, columns: int) -> None:
+        if self._per_column:
+            if len(self._aggregations) != columns:
+                raise ValueError(
+                    f'aggregations has different length with the columns of reader, expect {columns} but got {len(self._aggregations)}'
+                )
+
+            return
+
+        for column, _ in self._aggregations:
+            if not 0 <= column < columns:
+                raise ValueError(
+                    f'column must be in [0, {columns}), but got `{column}`'
+                )
+
+    @property
+    def lines(self) -> int:
+        """How many aggregated lines the reader has read
+        """
+
+        return self._lines
+
+    def reset(self) -> None:
+        self._reader.reset()
+
+        self._lines = 0
+        self._exhausted = False
+
+        # The lines of the last group which might be incomplete
+        self._pending = None
+        self._aggregated: Deque[List[T]] = deque()
+
+    def _group_starts(self, block: np.ndarray) -> np.ndarray:
+        if self._count is not None:
+            # `self._pending` always starts at the beginning of a group
+            return np.arange(0, len(block), self._count)
+
+        keys = block[:, self._key]
+
+        if self._interval is not None:
+            keys = np.floor_divide(keys, self._interval)
+
+        return np.flatnonzero(
+            np.concatenate(([True], keys[1:] != keys[:-1]))
+        )
+
+    def _aggregate_chunk(self) -> None:
+        chunk = self._reader.readlines(self._chunk_size)
+
+        if len(chunk) < self._chunk_size:
+            self._exhausted = True
+
+        if len(chunk):
+            block = np.array(chunk)
+
+            if self._reader.columns is None:
+                self._check_columns(block.shape[1])
+
+            if self._pending is not None:
+                block = np.concatenate((self._pending, block))
+        elif self._pending is not None:
+            block = self._pending
+        else:
+            return
+
+        starts = self._group_starts(block)
+
+        if self._exhausted:
+            self._pending = None
+        else:
+            # The last group might continue in the next chunk
+            self._pending = block[starts[-1]:]
+            block = block[:starts[-1]]
+            starts = starts[:-1]
+
+        if not len(starts):
+            return
+
+        ends = np.append(starts[1:], len(block))
+
+        aggregated = {
+            name: _aggregate(name, block, starts, ends)
+            for name in {name for _, name in self._aggregations}
+        }
+
+        result = np.empty(
+            (len(starts), len(self._aggregations)),
+            dtype=float if self.dtype is float else block.dtype
+        )
+
+        for i, (column, name) in enumerate(self._aggregations):
+            result[:, i] = aggregated[name][:, column]
+
+        self._aggregated.extend(result.tolist())
+
+    def readline(self) -> Optional[List[T]]:
+        if self._lines == self._max_lines:
+            return
+
+        while not self._aggregated:
+            if self._exhausted and self._pending is None:
+                return
+
+            self._aggregate_chunk()
+
+        self._lines += 1
+
+        return self._aggregated.popleft()
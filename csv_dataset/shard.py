@@ -0,0 +1,187 @@
+from typing import (
+    List,
+    Iterable,
+    Optional
+)
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import json
+
+import numpy as np
+
+from .reader import (
+    AbstractReader,
+    T
+)
+
+
+SHARD_SIZE = 1024 * 1024
+MANIFEST = 'manifest.json'
+
+
+def _shard_name(index: int) -> str:
+    return f'shard-{index:05d}.npy'
+
+
+def save_shards(
+    dirpath: str,
+    chunks: Iterable[np.ndarray],
+    **spec
+) -> int:
+    """Saves each chunk of lines as a `.npy` shard file, and writes the manifest
+
+    Args:
+        dirpath (str): the directory to save shards to
+        chunks (Iterable[np.ndarray]): the chunks of lines
+        **spec: the window, batch and remainder settings to be saved into the manifest
+
+    Returns:
+        int: the total number of lines saved
+    """
+
+    path = Path(dirpath)
+    path.mkdir(parents=True, exist_ok=True)
+
+    shards = []
+    total = 0
+    dtype = None
+
+    for chunk in chunks:
+        filename = _shard_name(len(shards))
+        np.save(path / filename, chunk)
+
+        shards.append(dict(
+            file=filename,
+            lines=len(chunk)
+        ))
+        total += len(chunk)
+        dtype = chunk.dtype.str
+
+    with open(path / MANIFEST, 'w') as f:
+        json.dump(dict(
+            dtype=dtype,
+            lines=total,
+            shards=shards,
+            **spec
+        ), f, indent=2)
+
+    return total
+
+
+class ShardReader(AbstractReader[T]):
+    """Reads the lines saved by `Dataset.save()`
+
+    Args:
+        dirpath (str): the directory of the shards
+        mmap_mode (:obj:`str`, optional): the memory-map mode of the shards. If None, shards will be loaded into memory
+        workers (:obj:`int`, optional): if specified, shards are loaded by `workers` threads in parallel
+        max_lines (:obj:`int`, optional)
+    """
+
+    def __init__(
+        self,
+        dirpath: str,
+        mmap_mode: Optional[str] = 'r',
+        workers: Optional[int] = None,
+        max_lines: Optional[int] = None
+    ):
+        path = Path(dirpath)
+
+        with open(path / MANIFEST) as f:
+            self.manifest = json.load(f)
+
+        def load(shard: dict) -> np.ndarray:
+            return np.load(path / shard['file'], mmap_mode=mmap_mode)
+
+        shards = self.manifest['shards']
+
+        if workers:
+            with ThreadPoolExecutor(workers) as executor:
+                self._shards: List[np.ndarray] = list(
+                    executor.map(load, shards)
+                )
+        else:
+            self._shards = [load(shard) for shard in shards]
+
+        self.dtype = int if np.dtype(
+            self.manifest['dtype'] or float
+        ).kind in 'iu' else float
+
+        self.max_lines = max_lines
+
+        self.reset()
+
+    @property
+    def max_lines(self) -> Optional[int]:
+        lines = self.manifest['lines']
+
+        return lines if self._max_lines is None else min(
+            self._max_lines, lines
+        )
+
+    @max_lines.setter
+    def max_lines(self, max_lines: Optional[int]) -> None:
+        self._set_max_lines(max_lines)
+
+    @property
+    def columns(self) -> Optional[int]:
+        return self._shards[0].shape[1] if self._shards else None
+
+    @property
+    def lines(self) -> int:
+        """How many lines the reader has read
+        """
+
+        return self._lines
+
+    def reset(self) -> None:
+        self._lines = 0
+        self._shard = 0
+        self._pos = 0
+
+    def tail(self, lines: int) -> None:
+        self.reset()
+
+        skip = max(0, self.manifest['lines'] - lines)
+
+        for shard in self._shards:
+            if skip < len(shard):
+                break
+
+            skip -= len(shard)
+            self._shard += 1
+
+        self._pos = skip
+
+    def readlines(self, lines: int) -> np.ndarray:
+        lines = max(0, min(lines, self.max_lines - self._lines))
+        chunks = []
+        rest = lines
+
+        while rest and self._shard < len(self._shards):
+            shard = self._shards[self._shard]
+            chunk = shard[self._pos:self._pos + rest]
+
+            chunks.append(chunk)
+            rest -= len(chunk)
+            self._pos += len(chunk)
+
+            if self._pos == len(shard):
+                self._shard += 1
+                self._pos = 0
+
+        self._lines += lines - rest
+
+        if not chunks:
+            return np.empty((0, 0))
+
+        if len(chunks) == 1:
+            # Avoid copying lines within a single shard
+            return chunks[0]
+
+        return np.concatenate(chunks)
+
+    def readline(self) -> Optional[List[T]]:
+        lines = self.readlines(1)
+
+        return lines[0].tolist() if len(lines) else None
@@ -0,0 +1,174 @@
+from typing import (
+    BinaryIO,
+    Optional
+)
+from abc import (
+    ABC,
+    abstractmethod
+)
+import mmap
+import os
+
+
+class AbstractSource(ABC):
+    """The byte source of `CsvReader`
+    """
+
+    @property
+    @abstractmethod
+    def size(self) -> int:
+        """The current size (bytes) of the source
+        """
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def stat(self) -> os.stat_result:
+        """The status of the opened file, which might be different from the file at the path if the file has been replaced
+        """
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def readline(self) -> bytes:
+        """Reads a line including the trailing newline, returns `b''` at EOF
+        """
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def read(self, size: int) -> bytes:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def seek(self, offset: int) -> None:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def tell(self) -> int:
+        ...  # pragma: no cover
+
+    @abstractmethod
+    def close(self) -> None:
+        ...  # pragma: no cover
+
+
+class FileSource(AbstractSource):
+    """Reads the file via a buffered binary file object, which works for any kind of files
+    """
+
+    def __init__(self, filepath: str):
+        self._file: BinaryIO = open(filepath, 'rb')
+
+    def stat(self) -> os.stat_result:
+        return os.fstat(self._file.fileno())
+
+    @property
+    def size(self) -> int:
+        return self.stat().st_size
+
+    def readline(self) -> bytes:
+        return self._file.readline()
+
+    def read(self, size: int) -> bytes:
+        return self._file.read(size)
+
+    def seek(self, offset: int) -> None:
+        self._file.seek(offset)
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class MmapSource(AbstractSource):
+    """Reads the file via a read-only memory map, so that seeking is a pointer move and each line is copied once from the mapped pages without going through the buffers of file objects.
+
+    The size of the file is checked before each read, and the file is mapped again if it has grown or been truncated. A file truncated to before the current position is read as EOF. However, the file might be still truncated between the check and the read, in which case touching the pages beyond the end of the file crashes the process with SIGBUS, so it should only be used for files which are never truncated in place, e.g. by log rotation with copytruncate.
+    """
+
+    def __init__(self, filepath: str):
+        self._file = open(filepath, 'rb')
+        self._mmap: Optional[mmap.mmap] = None
+        # The number of mapped bytes
+        self._length = 0
+        # The position if nothing is mapped
+        self._offset = 0
+
+        self._map(self.stat().st_size)
+
+    def _map(self, size: int) -> None:
+        offset = self.tell()
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+        self._length = size
+        self._offset = 0
+
+        if not size:
+            # An empty file could not be mapped
+            return
+
+        self._mmap = mmap.mmap(
+            self._file.fileno(),
+            size,
+            access=mmap.ACCESS_READ
+        )
+
+        if hasattr(mmap, 'MADV_SEQUENTIAL'):  # pragma: no cover
+            # Let the OS read ahead aggressively
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+        self._mmap.seek(min(offset, size))
+
+    def stat(self) -> os.stat_result:
+        return os.fstat(self._file.fileno())
+
+    @property
+    def size(self) -> int:
+        size = self.stat().st_size
+
+        if size != self._length:
+            # The file has grown or been truncated
+            self._map(size)
+
+        return size
+
+    def readline(self) -> bytes:
+        # Checks the size before touching the mapped pages
+        if not self.size:
+            return b''
+
+        return self._mmap.readline()
+
+    def read(self, size: int) -> bytes:
+        if not self.size:
+            return b''
+
+        return self._mmap.read(size)
+
+    def seek(self, offset: int) -> None:
+        if self._mmap is None:
+            self._offset = offset
+            return
+
+        self._mmap.seek(min(offset, self._length))
+
+    def tell(self) -> int:
+        return self._offset if self._mmap is None else self._mmap.tell()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+
+        self._file.close()
+
+
+def open_source(filepath: str) -> AbstractSource:
+    """Opens a `FileSource`, which is safe even if the file is truncated while being read.
+
+    Pass `source=MmapSource` to `CsvReader` to memory-map files which are never truncated in place.
+    """
+
+    return FileSource(filepath)
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import numpy as np
+
+from csv_dataset import CsvReader
+
+
+csv_path = Path(Path(__file__).resolve()).parent.parent / \
+    'example' / 'stock.csv'
+
+# The open, high, low, close and volume columns of the example csv file
+OHLCV_COLUMNS = [2, 3, 4, 5, 6]
+
+
+def create_reader(
+    filepath=csv_path,
+    indexes=OHLCV_COLUMNS,
+    **kwargs
+):
+    """Creates a float reader of the example csv file or a file of the same layout
+    """
+
+    return CsvReader(
+        filepath,
+        float,
+        indexes,
+        header=True,
+        **kwargs
+    )
+
+
+def read_all(reader) -> list:
+    """Reads all lines of `reader` one by one
+    """
+
+    lines = []
+
+    while True:
+        line = reader.readline()
+
+        if line is None:
+            return lines
+
+        lines.append(line)
+
+
+def read_array(reader) -> np.ndarray:
+    """Reads all lines of `reader` into an array
+    """
+
+    return np.array(read_all(reader))
+
+
+def read_batches(dataset) -> list:
+    """Reads all batches of `dataset` with their masks
+    """
+
+    return [(batch, dataset.mask) for batch in dataset]
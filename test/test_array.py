@@ -0,0 +1,109 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    ArrayReader,
+    Dataset
+)
+
+
+def create_array():
+    return np.arange(60, dtype=float).reshape(20, 3)
+
+
+def test_array_reader():
+    array = create_array()
+    reader = ArrayReader(array, max_lines=5)
+
+    assert reader.dtype is float
+    assert reader.max_lines == 5
+
+    assert reader.readline() == [0, 1, 2]
+
+    lines = reader.readlines(10)
+    assert np.shares_memory(lines, array)
+    np.testing.assert_array_equal(lines, array[1:5])
+
+    assert reader.lines == 5
+    assert reader.readline() is None
+
+    reader.max_lines = None
+    reader.reset()
+    assert reader.max_lines == 20
+    assert len(reader.readlines(100)) == 20
+
+    reader.tail(2)
+    np.testing.assert_array_equal(reader.readlines(100), array[-2:])
+
+
+def test_array_reader_data():
+    array = create_array()
+
+    class DataFrame:
+        def to_numpy(self):
+            return array
+
+    assert ArrayReader(DataFrame()).array is array
+
+    columns = ArrayReader([array[:, 0], array[:, 1]], max_lines=5)
+    assert columns.dtype is float
+    assert columns.columns == 2
+    assert columns.max_lines == 5
+
+    # The columns are only stacked when lines are read
+    assert columns.array is None
+    np.testing.assert_array_equal(columns.readlines(3), array[:3, :2])
+    np.testing.assert_array_equal(columns.readlines(3), array[3:5, :2])
+
+    dataset = Dataset(ArrayReader([array[:, 0], array[:, 1]])).window(3)
+    np.testing.assert_array_equal(dataset.get(), array[:3, :2])
+
+    assert ArrayReader(np.arange(4).reshape(2, 2)).dtype is int
+
+    with pytest.raises(ValueError, match='2-dimensional'):
+        ArrayReader(np.arange(4))
+
+    with pytest.raises(ValueError, match='same length'):
+        ArrayReader([array[:, 0], array[:3, 1]])
+
+    with pytest.raises(ValueError, match='at least one column'):
+        ArrayReader([])
+
+
+def test_dataset_with_array_reader():
+    array = create_array()
+
+    dataset = Dataset(ArrayReader(array)).window(3, 2).batch(2)
+
+    assert dataset.max_reads() == 4
+
+    batches = list(dataset)
+    assert len(batches) == 4
+
+    for i, batch in enumerate(batches):
+        # Batches are views of the array
+        assert np.shares_memory(batch, array)
+        np.testing.assert_array_equal(batch, [
+            array[i * 4:i * 4 + 3],
+            array[i * 4 + 2:i * 4 + 5]
+        ])
+
+    dataset.reset()
+    np.testing.assert_array_equal(dataset.read(2)[1], batches[1])
+
+    np.testing.assert_array_equal(
+        dataset.read(1, reset_buffer=True)[0],
+        [array[9:12], array[11:14]]
+    )
+
+    np.testing.assert_array_equal(dataset.latest(), [
+        array[-5:-2], array[-3:]
+    ])
+
+    # Features could not be views
+    featured = Dataset(ArrayReader(array)).window(3, 2).features(['max'])
+    np.testing.assert_array_equal(
+        featured.get(),
+        np.concatenate((array[:3], array[:3]), axis=1)
+    )
@@ -0,0 +1,172 @@
+import os
+import shutil
+import threading
+
+import numpy as np
+
+from csv_dataset import (
+    Dataset,
+    ParsedCache,
+    RangeNormalizer
+)
+
+from . import (
+    create_reader,
+    csv_path
+)
+
+
+def test_parsed_cache():
+    cache = ParsedCache(max_bytes=200)
+
+    a = cache.put('a', np.zeros(10))
+    cache.put('b', np.zeros(10))
+
+    assert not a.flags.writeable
+    assert cache.get('a') is a
+
+    # 'b' is the least recently used one
+    cache.put('c', np.zeros(10))
+
+    assert cache.get('b') is None
+    assert cache.stats == dict(
+        hits=1,
+        misses=1,
+        evictions=1,
+        entries=2,
+        bytes=160
+    )
+
+    # Arrays larger than the budget are not cached
+    cache.put('d', np.zeros(100))
+    assert cache.get('d') is None
+
+    cache.max_bytes = 80
+    assert cache.stats['entries'] == 1
+    assert cache.get('a') is None
+
+    cache.clear()
+    assert cache.stats['bytes'] == 0
+
+
+def test_parsed_cache_threads():
+    cache = ParsedCache()
+    parsed = []
+    results = []
+
+    def parse(max_bytes):
+        parsed.append(1)
+        return np.arange(3)
+
+    def get():
+        results.append(cache.get_or_parse('key', parse))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(parsed) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_reader_cache():
+    cache = ParsedCache()
+
+    expected = Dataset(create_reader()).window(5).batch(2).read(5)
+
+    reader = create_reader(cache=cache, max_lines=20)
+    dataset = Dataset(reader).window(5).batch(2)
+    got = dataset.read(5)
+
+    np.testing.assert_array_equal(got[:2], expected[:2])
+    assert got[2] is None
+    assert reader.max_lines == 20
+
+    # Batches are views of the cached lines
+    assert np.shares_memory(got[0], reader.array)
+
+    # Another reader of the same file and settings hits the cache
+    another = create_reader(cache=cache)
+    assert another.array is reader.array
+    assert another.readline() == expected[0][0][0].tolist()
+    assert cache.stats['entries'] == 1
+
+    # Different settings
+    create_reader(cache=cache, missing='ffill')
+    create_reader(cache=cache, normalizers=[
+        RangeNormalizer(0, 10000)
+    ] * 5)
+    assert cache.stats['entries'] == 3
+
+    # The same normalizer settings
+    create_reader(cache=cache, normalizers=[
+        RangeNormalizer(0, 10000)
+    ] * 5)
+    assert cache.stats['entries'] == 3
+
+
+def test_reader_cache_modified(tmp_path):
+    filepath = tmp_path / 'stock.csv'
+    shutil.copy(csv_path, filepath)
+
+    cache = ParsedCache()
+    reader = create_reader(filepath, cache=cache)
+
+    assert len(reader.array) == 99
+
+    with open(filepath, 'a') as f:
+        f.write('100,0,1,1,1,1,1\n')
+
+    reader.reset()
+
+    assert len(reader.array) == 100
+    assert cache.stats['misses'] == 2
+
+    # tail() reads the file directly
+    reader.tail(1)
+
+    assert reader.array is None
+    assert reader.readline() == [1., 1., 1., 1., 1.]
+
+
+def test_reader_cache_replaced(tmp_path):
+    filepath = tmp_path / 'stock.csv'
+    shutil.copy(csv_path, filepath)
+
+    cache = ParsedCache()
+    reader = create_reader(filepath, cache=cache)
+
+    assert len(reader.array) == 99
+
+    replacement = tmp_path / 'replacement.csv'
+    replacement.write_text('header\n1,0,1,1,1,1,1\n')
+    os.replace(replacement, filepath)
+
+    reader.reset()
+    np.testing.assert_array_equal(reader.array, [[1., 1., 1., 1., 1.]])
+
+    another = create_reader(filepath, cache=cache)
+    assert another.array is reader.array
+
+
+def test_reader_cache_oversized():
+    cache = ParsedCache(max_bytes=1000)
+
+    reader = create_reader(cache=cache)
+
+    # Falls back to streaming
+    assert reader.array is None
+    assert len(reader.readlines(200)) == 99
+    assert cache.stats['entries'] == 0
+
+    reader.reset()
+    assert reader.array is None
+    assert reader.readline() is not None
+
+    cache.max_bytes = 10000
+    reader.reset()
+    assert len(reader.array) == 99
@@ -1,14 +1,24 @@
-from pathlib import Path
+import os
 import pytest
 
+import numpy as np
+
 from csv_dataset import (
     CsvReader,
     Dataset,
     RangeNormalizer
 )
+from csv_dataset.source import (
+    FileSource,
+    MmapSource,
+    open_source
+)
 
-csv_path = Path(Path(__file__).resolve()).parent.parent / \
-    'example' / 'stock.csv'
+from . import (
+    create_reader,
+    csv_path,
+    read_all
+)
 
 
 def test_reader_exception():
@@ -254,3 +264,316 @@ def test_max_reads():
     assert data.max_reads(1) == 0
     assert data.max_reads(2) == 1
     assert data.max_reads(3) == 2
+
+
+@pytest.mark.parametrize('block_size', [64 * 1024, 100])
+def test_key_range(monkeypatch, tmp_path, block_size):
+    monkeypatch.setattr('csv_dataset.reader.INDEX_BLOCK_SIZE', block_size)
+
+    def create(**kwargs):
+        return create_reader(indexes=[1, 2, 3, 4, 5, 6], **kwargs)
+
+    lines = read_all(create())
+
+    start = 1576771500000
+    end = 1576772700000
+
+    reader = create(key_column=1, start=start, end=end)
+
+    expected = [
+        line for line in lines
+        if start <= line[0] < end
+    ]
+
+    assert read_all(reader) == expected
+    assert reader.max_lines == len(expected) == 20
+
+    # The sparse index is reused after reset
+    reader.reset()
+    assert read_all(reader) == expected
+
+    # Open ranges
+    assert read_all(create(key_column=1, start=start)) == [
+        line for line in lines if line[0] >= start
+    ]
+
+    assert read_all(create(key_column=1, end=end)) == [
+        line for line in lines if line[0] < end
+    ]
+
+    # Empty range
+    empty = create(key_column=1, start=end, end=start)
+    assert read_all(empty) == []
+    assert Dataset(empty).max_reads() == 0
+
+    data = Dataset(create(key_column=1, start=start, end=end)).window(5, 1)
+    assert data.max_reads() == 16
+    assert len(list(data)) == 16
+
+    # Only valid records are counted
+    range_start = 1576771200000
+    reader = create(key_column=1, start=range_start, end=start)
+    assert reader.max_lines == len(read_all(reader)) == 5
+
+    data = Dataset(
+        create(key_column=1, start=range_start, end=start)
+    ).window(5)
+    assert data.max_reads() == 1
+    assert len(list(data)) == 1
+
+    limited = create(key_column=1, start=start, end=end, max_lines=3)
+    assert limited.max_lines == 3
+    assert read_all(limited) == expected[:3]
+
+    # The file grows
+    filepath = tmp_path / 'growing.csv'
+    filepath.write_text(csv_path.read_text())
+
+    def create_growing(**kwargs):
+        return create_reader(
+            filepath,
+            indexes=[1, 2, 3, 4, 5, 6],
+            key_column=1,
+            **kwargs
+        )
+
+    open_ended = create_growing(start=start)
+    closed = create_growing(start=start, end=1576777260000)
+
+    assert len(read_all(open_ended)) == open_ended.max_lines == 94
+    assert len(read_all(closed)) == closed.max_lines == 94
+
+    with open(filepath, 'a') as f:
+        f.write('99,1576777140000,1,1,1,1,1\n')
+
+    # Appended lines are read to EOF without reset()
+    assert read_all(open_ended) == [[1576777140000, 1, 1, 1, 1, 1]]
+
+    for reader in (open_ended, closed):
+        reader.reset()
+        assert len(read_all(reader)) == reader.max_lines == 95
+
+    with pytest.raises(ValueError, match='key_column'):
+        create(start=start)
+
+
+@pytest.mark.parametrize('block_size', [64 * 1024, 50])
+def test_tail(monkeypatch, tmp_path, block_size):
+    monkeypatch.setattr('csv_dataset.reader.TAIL_BLOCK_SIZE', block_size)
+
+    lines = read_all(create_reader())
+
+    reader = create_reader()
+    reader.tail(5)
+
+    assert read_all(reader) == lines[-5:]
+    assert reader.lines == 5
+
+    reader.tail(1000)
+    assert read_all(reader) == lines
+
+    reader.reset()
+    assert read_all(reader) == lines
+
+    # Invalid and incomplete lines
+    filepath = tmp_path / 'growing.csv'
+    filepath.write_text(''.join([
+        csv_path.read_text(),
+        '1,1576771270000,null,null,1,1,1\n',
+        '1,1576771270000,1,1,1'
+    ]))
+
+    reader = create_reader(filepath)
+    reader.tail(2)
+    assert read_all(reader) == lines[-2:]
+
+    dataset = Dataset(create_reader(filepath)).window(5, 1).batch(2)
+
+    latest = dataset.latest()
+    np.testing.assert_array_equal(latest, [lines[-6:-1], lines[-5:]])
+
+    # Get the latest batch again
+    np.testing.assert_array_equal(dataset.latest(), latest)
+
+    # An incomplete line longer than a block
+    filepath.write_text(''.join([
+        csv_path.read_text(),
+        '1,1576771270000,' + '1' * 200
+    ]))
+
+    reader = create_reader(filepath)
+    reader.tail(2)
+    assert read_all(reader) == lines[-2:]
+
+    # Only the lines within the key range
+    start = 1576771500000
+    end = 1576772700000
+
+    def create_range(**kwargs):
+        return create_reader(
+            indexes=[1, 2, 3, 4, 5, 6],
+            key_column=1,
+            **kwargs
+        )
+
+    expected = read_all(create_range(start=start, end=end))
+
+    reader = create_range(start=start, end=end)
+    reader.tail(3)
+    assert read_all(reader) == expected[-3:]
+
+    reader.tail(1000)
+    assert read_all(reader) == expected
+
+    dataset = Dataset(create_range(start=start, end=end)).window(5)
+    np.testing.assert_array_equal(dataset.latest(), expected[-5:])
+
+    reader = create_range(start=start)
+    reader.tail(1000)
+    assert read_all(reader) == read_all(create_range(start=start))
+
+    reader = create_range(start=end, end=start)
+    reader.tail(3)
+    assert read_all(reader) == []
+
+
+@pytest.mark.parametrize('source', [FileSource, MmapSource])
+def test_sources(tmp_path, source):
+    assert isinstance(open_source(csv_path.absolute()), FileSource)
+
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('')
+
+    lines = read_all(create_reader())
+    assert len(lines) == 99
+
+    assert read_all(create_reader(source=source)) == lines
+    assert read_all(create_reader(empty, source=source)) == []
+
+    # The file grows after the reader is created
+    filepath = tmp_path / 'growing.csv'
+    filepath.write_text(csv_path.read_text())
+
+    reader = create_reader(filepath, source=source)
+    reader.tail(1)
+    assert read_all(reader) == lines[-1:]
+
+    with open(filepath, 'a') as f:
+        f.write('1,1576777200000,1,2,3,4,5\n')
+
+    reader.tail(2)
+    assert read_all(reader) == lines[-1:] + [[1, 2, 3, 4, 5]]
+
+    # The reader is created before the file grows
+    reader = create_reader(filepath, source=source)
+    assert len(read_all(reader)) == 100
+
+    with open(filepath, 'a') as f:
+        f.write('2,1576777260000,2,3,4,5,6\n')
+
+    reader.reset()
+    assert len(read_all(reader)) == 101
+
+    # The reader has reached the end before the file grows
+    with open(filepath, 'a') as f:
+        f.write('3,1576777320000,3,4,5,6,7\n')
+
+    assert read_all(reader) == [[3, 4, 5, 6, 7]]
+
+    # The file is truncated in place while being read
+    reader.reset()
+    assert len(reader.readlines(3)) == 3
+
+    os.truncate(filepath, 0)
+    rest = reader.readlines(1000)
+
+    if source is MmapSource:
+        assert rest == []
+    else:
+        # Only the lines in the buffer of the file object
+        assert len(rest) < 100
+
+    with open(filepath, 'a') as f:
+        f.write('header\n1,1576777200000,1,2,3,4,5\n')
+
+    reader.reset()
+    assert read_all(reader) == [[1, 2, 3, 4, 5]]
+
+    # An empty file grows
+    reader = create_reader(empty, source=source)
+    assert read_all(reader) == []
+
+    empty.write_text('header\n1,1576777200000,1,2,3,4,5\n')
+    reader.reset()
+    assert read_all(reader) == [[1, 2, 3, 4, 5]]
+
+
+def test_quoted_fields(tmp_path):
+    filepath = tmp_path / 'quoted.csv'
+    filepath.write_text(
+        'name,open,close\n'
+        '"Acme, Inc.",1,2\n'
+        '"The ""Best"" Co.",3,4\n'
+        '"Multi\nline, name",5,6\n'
+        'plain,7,8\n'
+        '"1.5",9,10\n'
+    )
+
+    def create(**kwargs):
+        return CsvReader(
+            filepath,
+            float,
+            [1, 2],
+            header=True,
+            **kwargs
+        )
+
+    assert read_all(create()) == [
+        [1, 2], [3, 4], [5, 6], [7, 8], [9, 10]
+    ]
+
+    reader = create(max_lines=3)
+    assert read_all(reader) == [[1, 2], [3, 4], [5, 6]]
+    assert reader.lines == 3
+
+    # Quoted numbers
+    assert read_all(
+        CsvReader(filepath, float, [0], header=True)
+    ) == [[1.5]]
+
+    # Without quoting, quoted commas and newlines break lines
+    unquoted = read_all(create(quotechar=None))
+    assert [1, 2] not in unquoted
+    assert [5, 6] not in unquoted
+
+
+def test_stray_quotes(tmp_path, monkeypatch):
+    filepath = tmp_path / 'stray.csv'
+    filepath.write_text(
+        '1,2\n'
+        '3",4\n'
+        '5,6\n'
+        '7",8\n'
+        '9,10\n'
+        '11,12\n'
+        '13",14\n'
+        '15,16\n'
+    )
+
+    def create(**kwargs):
+        return CsvReader(filepath, float, [0, 1], **kwargs)
+
+    expected = [[1, 2], [5, 6], [9, 10], [11, 12], [15, 16]]
+
+    # Lines with stray quotes are dropped
+    assert read_all(create()) == expected
+
+    reader = create(missing='nan')
+    lines = read_all(reader)
+
+    assert len(lines) == 8
+    assert np.isnan(lines[1][0])
+
+    # The unclosed quote is given up after MAX_QUOTED_LINES lines
+    monkeypatch.setattr('csv_dataset.reader.MAX_QUOTED_LINES', 1)
+    assert read_all(create()) == expected
@@ -0,0 +1,123 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    ArrayReader,
+    Dataset,
+    RollingFeatures
+)
+
+from . import create_reader
+
+
+def naive_features(lines, period):
+    features = []
+
+    for i in range(len(lines)):
+        window = lines[max(0, i - period + 1):i + 1]
+        previous = lines[max(0, i - 1)]
+
+        features.append(np.concatenate((
+            window.mean(axis=0),
+            window.std(axis=0),
+            window.min(axis=0),
+            window.max(axis=0),
+            lines[i] / previous - 1
+        )))
+
+    return np.array(features)
+
+
+@pytest.mark.parametrize('period,steps', [
+    (1, [3, 4]),
+    (4, [1]),
+    (7, [3, 1, 10]),
+    (20, [50])
+])
+def test_rolling_features(period, steps):
+    lines = np.random.RandomState(period).rand(60, 3) + 1
+    expected = naive_features(lines, period)
+
+    features = RollingFeatures(
+        ['mean', 'std', 'min', 'max', 'return'],
+        period
+    )
+
+    for _ in range(2):
+        computed = []
+        begin = 0
+        i = 0
+
+        while begin < len(lines):
+            end = begin + steps[i % len(steps)]
+            computed.append(features.compute(lines[begin:end]))
+            begin = end
+            i += 1
+
+        np.testing.assert_allclose(np.concatenate(computed), expected)
+
+        features.reset()
+
+
+def test_rolling_features_errors():
+    with pytest.raises(ValueError, match='feature'):
+        RollingFeatures(['median'], 3)
+
+    with pytest.raises(ValueError, match='period'):
+        RollingFeatures(['mean'], 0)
+
+
+def test_dataset_features():
+    lines = np.array(Dataset(create_reader()).read(100)[:-1])
+    expected = np.concatenate(
+        (lines, naive_features(lines, 3)[:, :10]),
+        axis=1
+    )
+
+    dataset = Dataset(create_reader()).window(3, 2).batch(2).features(
+        ['mean', 'std']
+    )
+
+    assert dataset.get().shape == (2, 3, 15)
+
+    dataset.reset()
+
+    for i, got in enumerate(dataset):
+        np.testing.assert_allclose(got, [
+            expected[i * 4:i * 4 + 3],
+            expected[i * 4 + 2:i * 4 + 5]
+        ])
+
+    assert i == 23
+
+    with pytest.raises(RuntimeError, match='forbidden'):
+        dataset.features()
+
+
+@pytest.mark.parametrize('period', [None, 1, 20])
+def test_dataset_latest_features(period):
+    def create():
+        return Dataset(create_reader()).window(5, 1).features(
+            period=period
+        )
+
+    # The last batch ends at the last line
+    expected = list(create())[-1]
+
+    dataset = create()
+    np.testing.assert_allclose(dataset.latest(), expected)
+    np.testing.assert_allclose(dataset.latest(), expected)
+
+    # The reader has fewer lines than the batch and the warm-up lines
+    lines = np.array(create_reader(max_lines=10).readlines(10))
+
+    def create_short():
+        return Dataset(ArrayReader(lines)).window(5, 1).features(
+            period=20
+        )
+
+    np.testing.assert_allclose(
+        create_short().latest(),
+        list(create_short())[-1]
+    )
@@ -0,0 +1,207 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    ArrayReader,
+    Dataset,
+    MergeReader
+)
+
+from . import (
+    create_reader,
+    csv_path,
+    read_array
+)
+
+
+def asof(array, key):
+    """The columns of the last line of `array` at or before `key`
+    """
+
+    before = array[array[:, 0] <= key]
+
+    if not len(before):
+        return [np.nan] * (array.shape[1] - 1)
+
+    return before[-1, 1:].tolist()
+
+
+def create_arrays():
+    a = np.array([
+        [1, 10],
+        [3, 30],
+        [3, 31],
+        [5, 50],
+        [8, 80],
+        [9, 90]
+    ], dtype=float)
+    b = np.array([
+        [2, 200, 201],
+        [3, 300, 301],
+        [4, 400, 401],
+        [4, 410, 411],
+        [10, 1000, 1001]
+    ], dtype=float)
+
+    return a, b
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1024])
+def test_merge_asof(chunk_size):
+    a, b = create_arrays()
+
+    reader = MergeReader(
+        [ArrayReader(a), ArrayReader(b)],
+        0,
+        chunk_size=chunk_size
+    )
+
+    expected = np.array([
+        [key, value] + asof(b, key)
+        for key, value in a.tolist()
+    ])
+
+    np.testing.assert_array_equal(read_array(reader), expected)
+    assert reader.lines == 6
+
+    reader.reset()
+    reader.max_lines = 2
+
+    np.testing.assert_array_equal(read_array(reader), expected[:2])
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 1024])
+def test_merge_outer(chunk_size):
+    a, b = create_arrays()
+
+    reader = MergeReader(
+        [ArrayReader(b), ArrayReader(a)],
+        0,
+        how='outer',
+        chunk_size=chunk_size
+    )
+
+    keys = np.unique(np.concatenate((a[:, 0], b[:, 0])))
+    expected = np.array([
+        [key] + asof(b, key) + asof(a, key)
+        for key in keys
+    ])
+
+    np.testing.assert_array_equal(read_array(reader), expected)
+
+
+def test_merge_csv():
+    opens = read_array(create_reader(indexes=[1, 2, 5]))
+
+    reader = MergeReader(
+        [
+            create_reader(indexes=[1, 2, 5]),
+            # Only the first 50 lines
+            create_reader(indexes=[1, 2, 5], max_lines=50)
+        ],
+        0,
+        chunk_size=8
+    )
+
+    dataset = Dataset(reader).window(3).batch(2)
+    batch = dataset.get()
+
+    assert batch.shape == (2, 3, 5)
+    np.testing.assert_array_equal(batch[0, :, :3], opens[:3])
+    np.testing.assert_array_equal(batch[0, :, 3:], opens[:3, 1:])
+
+    # The rest lines after the 6 lines read by the dataset
+    lines = read_array(reader)
+
+    assert len(lines) == len(opens) - 6
+    # Forward-filled by the 50th line
+    np.testing.assert_array_equal(lines[-1, 3:], opens[49, 1:])
+
+
+@pytest.mark.parametrize('how', ['asof', 'outer'])
+def test_merge_empty(tmp_path, how):
+    a, b = create_arrays()
+
+    # Empty readers are merged as NaN columns
+    reader = MergeReader([ArrayReader(a), ArrayReader(b[:0])], 0, how=how)
+    lines = read_array(reader)
+
+    np.testing.assert_array_equal(
+        lines[:, :2],
+        read_array(MergeReader([ArrayReader(a)], 0, how=how))
+    )
+    assert np.isnan(lines[:, 2:]).all()
+
+    # A csv file with only the header
+    filepath = tmp_path / 'empty.csv'
+    filepath.write_text(csv_path.read_text().splitlines()[0] + '\n')
+
+    empty = create_reader(filepath, indexes=[1, 2, 5])
+    lines = read_array(MergeReader([
+        create_reader(indexes=[1, 2, 5]),
+        empty
+    ], 0, how=how))
+
+    assert lines.shape == (99, 5)
+    assert np.isnan(lines[:, 3:]).all()
+
+    if how == 'asof':
+        # No lines to be merged with
+        assert not len(read_array(MergeReader([empty, empty], 0)))
+
+
+def test_merge_leading_history():
+    # The second reader starts much earlier than the first one
+    a = np.array([[100000, 1], [100005, 2], [100020, 3]], dtype=float)
+    b = np.column_stack((
+        np.arange(100011),
+        np.arange(100011) * 10
+    )).astype(float)
+
+    chunk_size = 64
+    reader = MergeReader(
+        [ArrayReader(a), ArrayReader(b)],
+        0,
+        chunk_size=chunk_size
+    )
+
+    second = reader._streams[1]
+    read = second.read
+    buffered = []
+
+    def read_chunk(size):
+        read(size)
+        buffered.append(len(second.rows))
+
+    second.read = read_chunk
+
+    np.testing.assert_array_equal(read_array(reader), [
+        [100000, 1, 1000000],
+        [100005, 2, 1000050],
+        [100020, 3, 1000100]
+    ])
+
+    # The rows are bounded by the chunk size instead of the gap
+    assert max(buffered) <= 2 * chunk_size + 1
+
+
+def test_merge_errors():
+    a, _ = create_arrays()
+
+    with pytest.raises(ValueError, match='must be one of'):
+        MergeReader([ArrayReader(a)], 0, how='inner')
+
+    with pytest.raises(ValueError, match='expect 1 but got 2'):
+        MergeReader([ArrayReader(a)], [0, 0])
+
+    # The number of columns of an empty merged reader is unknown
+    empty = MergeReader([ArrayReader(a[:0])], 0)
+
+    with pytest.raises(ValueError, match=r'readers\[1\] has no lines'):
+        MergeReader([ArrayReader(a), empty], 0)
+
+    dataset = Dataset(MergeReader([ArrayReader(a)], 0)).window(2)
+
+    with pytest.raises(TypeError, match='MergeReader does not support'):
+        dataset.latest()
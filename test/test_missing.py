@@ -0,0 +1,134 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    CsvReader,
+    Dataset
+)
+from csv_dataset.missing import MissingFiller
+
+from . import (
+    create_reader,
+    csv_path
+)
+
+
+nan = np.nan
+
+
+def test_missing_filler():
+    filler = MissingFiller(['nan', 'ffill', 'interpolate', 0])
+
+    np.testing.assert_array_equal(
+        filler.fill(np.array([
+            [nan, nan, nan, nan],
+            [1, 1, 1, 1],
+            [nan, nan, nan, nan]
+        ])),
+        [
+            [nan, nan, nan, 0],
+            [1, 1, 1, 1],
+            [nan, 1, 1, 0]
+        ]
+    )
+
+    # Continues from the previous block
+    np.testing.assert_array_equal(
+        filler.fill(np.array([
+            [nan, nan, nan, nan],
+            [2, 2, 4, 2],
+            [nan, nan, nan, 3]
+        ])),
+        [
+            [nan, 1, 3, 0],
+            [2, 2, 4, 2],
+            [nan, 2, 4, 3]
+        ]
+    )
+
+    assert filler.filled == [0, 3, 3, 3]
+
+    filler.reset()
+
+    assert filler.filled == [0, 0, 0, 0]
+    np.testing.assert_array_equal(
+        filler.fill(np.array([[nan, nan, nan, nan]])),
+        [[nan, nan, nan, 0]]
+    )
+
+
+def test_missing_filler_drop():
+    filler = MissingFiller(['drop', 'ffill'])
+
+    np.testing.assert_array_equal(
+        filler.drop(np.array([
+            [1, nan],
+            [nan, 1],
+            [2, 2]
+        ])),
+        [
+            [1, nan],
+            [2, 2]
+        ]
+    )
+
+    with pytest.raises(ValueError, match='missing strategy'):
+        MissingFiller(['median'])
+
+
+@pytest.mark.parametrize('chunk_size', [1024, 2, 3])
+def test_reader_missing(monkeypatch, chunk_size):
+    monkeypatch.setattr(
+        'csv_dataset.reader.MISSING_CHUNK_SIZE',
+        chunk_size
+    )
+
+    dropped = Dataset(create_reader()).read(100)[:-1]
+
+    reader = create_reader(missing='ffill')
+    lines = Dataset(reader).read(101)[:-1]
+
+    # The line with missing cells is kept, so that lines are aligned
+    assert len(lines) == 100
+    assert reader.filled == [1, 1, 0, 0, 0]
+
+    np.testing.assert_array_equal(lines[:2], dropped[:2])
+    np.testing.assert_array_equal(lines[3:], dropped[2:])
+    np.testing.assert_array_equal(
+        lines[2],
+        [7142.89, 7142.99, 7120.7, 7125.73, 118.279931]
+    )
+
+    reader = create_reader(
+        missing=['interpolate', 0, 'drop', 'drop', 'drop']
+    )
+    line = Dataset(reader).read(3)[2]
+
+    np.testing.assert_allclose(line[1], 0)
+    np.testing.assert_allclose(
+        line[0],
+        # The line at the end of a chunk could not be interpolated
+        7142.89 if chunk_size == 3 else (7142.89 + 7125.76) / 2
+    )
+
+    reader = create_reader(missing=['drop', 'nan', 'nan', 'nan', 'nan'])
+    assert len(Dataset(reader).read(100)[:-1]) == 99
+
+
+def test_reader_missing_tail():
+    reader = create_reader(missing='nan', max_lines=5)
+    reader.tail(98)
+
+    lines = reader.readlines(10)
+
+    assert reader.lines == 5
+    assert np.isnan(lines[0][0])
+
+
+def test_reader_missing_errors():
+    with pytest.raises(ValueError, match='expect 5 but got 1'):
+        create_reader(missing=['nan'])
+
+    with pytest.raises(ValueError, match='require dtype float'):
+        CsvReader(csv_path.absolute(), int, [1], missing='nan')
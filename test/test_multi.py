@@ -0,0 +1,110 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    Dataset,
+    MultiDataset
+)
+
+from . import create_reader
+
+
+def test_multi_dataset():
+    reader = create_reader()
+    lines = np.array(Dataset(create_reader()).read(100)[:-1])
+
+    dataset = MultiDataset(reader)
+
+    dataset.view().window(5, 1)
+    dataset.view().window(3, 1).batch(2)
+    dataset.view()
+
+    assert dataset.lines_need(3) == 3
+
+    with pytest.raises(RuntimeError, match='forbidden'):
+        dataset.view()
+
+    small, batched, single = dataset.get()
+
+    # Every line is read only once
+    assert reader.lines == 1
+
+    assert small is None
+    assert batched is None
+    np.testing.assert_array_equal(single, lines[0])
+
+    # The batched view ends at line 4
+    _, batched, _ = dataset.read(3)[-1]
+    np.testing.assert_array_equal(batched, [lines[0:3], lines[1:4]])
+
+    small, batched, single = dataset.get()
+
+    assert reader.lines == 5
+
+    np.testing.assert_array_equal(small, lines[:5])
+    assert batched is None
+    np.testing.assert_array_equal(single, lines[4])
+
+    assert len(list(dataset)) == len(lines) - 5
+
+    dataset.reset()
+    assert len(dataset.read(3)[2]) == 3
+
+
+@pytest.mark.parametrize('settings', [
+    [(dict(size=16), 1), (dict(size=64, shift=4), 1), (dict(size=3), 2)],
+    [(dict(size=4), 1), (dict(size=6, shift=2), 2), (dict(size=3, stride=2), 1)]
+])
+def test_multi_dataset_views(settings):
+    dataset = MultiDataset(create_reader())
+
+    for window, batch in settings:
+        dataset.view().window(**window).batch(batch)
+
+    got = list(dataset)
+
+    # Each view produces the same batches as a standalone dataset
+    for i, (window, batch) in enumerate(settings):
+        expected = list(
+            Dataset(create_reader()).window(**window).batch(batch)
+        )
+        batches = [batches[i] for batches in got if batches[i] is not None]
+
+        assert len(batches) == len(expected)
+        np.testing.assert_array_equal(batches, expected)
+
+    assert dataset.max_reads(99) == len(got)
+    assert dataset.max_reads(dataset.lines_need(len(got))) == len(got)
+
+
+def test_multi_dataset_max_reads():
+    dataset = MultiDataset(create_reader(max_lines=20))
+
+    view = dataset.view().window(2, stride=3)
+
+    assert dataset.max_reads() == 3
+    assert dataset.max_reads() == Dataset(
+        create_reader(max_lines=20)
+    ).window(2, stride=3).max_reads()
+    assert len(list(dataset)) == 3
+
+    with pytest.raises(RuntimeError, match='forbidden'):
+        view.window(3)
+
+
+def test_multi_dataset_without_window():
+    lines = np.array(Dataset(create_reader(max_lines=3)).read(3))
+
+    dataset = MultiDataset(create_reader(max_lines=3))
+    dataset.view()
+    dataset.view().batch(1)
+
+    got = list(dataset)
+
+    assert len(got) == 3
+    np.testing.assert_array_equal(got[2][0], lines[2])
+    np.testing.assert_array_equal(got[2][1], lines[2])
+
+    with pytest.raises(RuntimeError, match='no view'):
+        MultiDataset(create_reader()).get()
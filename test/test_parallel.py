@@ -0,0 +1,209 @@
+from functools import partial
+from multiprocessing import shared_memory
+import gc
+import os
+import subprocess
+import sys
+
+import pytest
+import numpy as np
+
+from csv_dataset import (
+    Dataset,
+    ParallelDataset
+)
+
+from . import create_reader
+
+
+START = 1576771200000
+# 1 minute
+INTERVAL = 60 * 1000
+
+
+def create_dataset(index, workers, marker=None):
+    # Each worker reads 40 minutes of data
+    dataset = Dataset(
+        create_reader(
+            key_column=1,
+            start=START + index * 40 * INTERVAL,
+            end=START + (index + 1) * 40 * INTERVAL
+        )
+    ).window(5, 1).batch(2)
+
+    if marker is not None and index == 1 and not os.path.exists(marker):
+        # Fails once after reading some batches
+        dataset.read(3)
+        open(marker, 'w').close()
+        os._exit(1)
+
+    return dataset
+
+
+def create_remainder_dataset(index, workers, remainder):
+    # 40 lines of each worker are 2 whole batches and 10 lines
+    return create_dataset(index, workers).window(5).batch(3).remainder(
+        remainder
+    )
+
+
+def expected_batches(workers):
+    return [
+        list(create_dataset(index, workers))
+        for index in range(workers)
+    ]
+
+
+def interleave(batches):
+    result = []
+    i = 0
+
+    while any(i < len(worker_batches) for worker_batches in batches):
+        for worker_batches in batches:
+            if i < len(worker_batches):
+                result.append(worker_batches[i])
+        i += 1
+
+    return result
+
+
+def test_parallel_dataset_ordered():
+    expected = interleave(expected_batches(2))
+
+    dataset = ParallelDataset(create_dataset, workers=2, slots=2)
+
+    try:
+        got = [batch.copy() for batch in dataset]
+
+        np.testing.assert_array_equal(got, expected)
+
+        # Restart after reset
+        dataset.reset()
+        np.testing.assert_array_equal(dataset.get(), expected[0])
+        np.testing.assert_array_equal(dataset.get(), expected[1])
+    finally:
+        dataset.close()
+
+
+def test_parallel_dataset_unordered():
+    expected = expected_batches(3)
+
+    dataset = ParallelDataset(create_dataset, workers=3, ordered=False)
+
+    try:
+        got = [batch.copy() for batch in dataset]
+    finally:
+        dataset.close()
+
+    assert len(got) == sum(len(batches) for batches in expected)
+
+    flatten = np.array([batch for batches in expected for batch in batches])
+
+    for batch in got:
+        assert (flatten == batch).all(axis=(1, 2, 3)).any()
+
+
+def test_parallel_dataset_restart(tmp_path):
+    expected = interleave(expected_batches(2))
+
+    dataset = ParallelDataset(
+        partial(create_dataset, marker=str(tmp_path / 'failed')),
+        workers=2
+    )
+
+    try:
+        got = [batch.copy() for batch in dataset]
+    finally:
+        dataset.close()
+
+    assert (tmp_path / 'failed').exists()
+    np.testing.assert_array_equal(got, expected)
+
+
+def shm_exists(name):
+    try:
+        shared_memory.SharedMemory(name=name).close()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def test_parallel_dataset_close():
+    expected = interleave(expected_batches(2))
+
+    with ParallelDataset(create_dataset, workers=2) as dataset:
+        np.testing.assert_array_equal(dataset.get(), expected[0])
+        names = [worker.shm.name for worker in dataset._workers]
+
+    assert not dataset._workers
+    assert not any(shm_exists(name) for name in names)
+
+    # Released when the dataset is garbage collected
+    dataset = ParallelDataset(create_dataset, workers=2)
+    dataset.get()
+    names = [worker.shm.name for worker in dataset._workers]
+
+    del dataset
+    gc.collect()
+
+    assert not any(shm_exists(name) for name in names)
+
+
+def test_lazy_import():
+    # ParallelDataset is only imported when it is used
+    code = (
+        'import sys, csv_dataset; '
+        'assert "csv_dataset.parallel" not in sys.modules; '
+        'csv_dataset.ParallelDataset'
+    )
+
+    subprocess.run(
+        [sys.executable, '-c', code],
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    )
+
+
+def test_parallel_dataset_errors():
+    with pytest.raises(ValueError, match='workers'):
+        ParallelDataset(create_dataset, workers=0)
+
+    with pytest.raises(ValueError, match='slots'):
+        ParallelDataset(create_dataset, slots=0)
+
+
+@pytest.mark.parametrize('remainder', ['pad', 'partial'])
+def test_parallel_dataset_remainder(remainder):
+    factory = partial(create_remainder_dataset, remainder=remainder)
+
+    expected = []
+
+    for index in range(2):
+        dataset = factory(index, 2)
+
+        for batch in dataset:
+            expected.append((batch.copy(), dataset.mask.copy()))
+
+    expected = interleave([expected[:3], expected[3:]])
+
+    dataset = ParallelDataset(factory, workers=2)
+
+    try:
+        got = [(batch.copy(), dataset.mask.copy()) for batch in dataset]
+    finally:
+        dataset.close()
+
+    assert len(got) == 6
+
+    for (batch, mask), (expected_batch, expected_mask) in zip(got, expected):
+        np.testing.assert_array_equal(batch, expected_batch)
+        np.testing.assert_array_equal(mask, expected_mask)
+
+    last_batch, last_mask = got[-1]
+
+    if remainder == 'pad':
+        assert last_batch.shape == (3, 5, 5)
+        np.testing.assert_array_equal(last_mask.sum(axis=1), [5, 5, 0])
+    else:
+        assert last_batch.shape == (2, 5, 5)
+        assert last_mask.all()
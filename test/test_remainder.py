@@ -0,0 +1,130 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    ArrayReader,
+    CsvReader,
+    Dataset
+)
+
+from . import read_batches
+
+
+LINES = 25
+
+
+@pytest.fixture(params=['array', 'csv'])
+def create_reader(request, tmp_path):
+    array = np.arange(LINES * 2).reshape(LINES, 2)
+
+    if request.param == 'array':
+        return lambda lines=LINES: ArrayReader(array[:lines])
+
+    filepath = tmp_path / 'data.csv'
+    filepath.write_text(''.join(
+        f'{a},{b}\n' for a, b in array.tolist()
+    ))
+
+    return lambda lines=LINES: CsvReader(
+        filepath, int, [0, 1], max_lines=lines
+    )
+
+
+def test_remainder_drop(create_reader):
+    dataset = Dataset(create_reader()).window(5).batch(2)
+
+    assert len(read_batches(dataset)) == 2
+    assert dataset.mask is None
+
+
+def test_remainder_pad(create_reader):
+    dataset = Dataset(create_reader()).window(5).batch(2).remainder(
+        'pad', -1
+    )
+
+    batches = read_batches(dataset)
+
+    assert len(batches) == 3
+
+    batch, mask = batches[1]
+    assert mask.shape == (2, 5)
+    assert mask.all()
+
+    batch, mask = batches[2]
+    assert batch.shape == (2, 5, 2)
+    np.testing.assert_array_equal(batch[0, :, 0], [40, 42, 44, 46, 48])
+    np.testing.assert_array_equal(batch[1], np.full((5, 2), -1))
+    np.testing.assert_array_equal(mask, [[True] * 5, [False] * 5])
+
+    # The first batch is padded
+    dataset = Dataset(create_reader(7)).window(5).batch(2).remainder('pad')
+    batch, mask = read_batches(dataset)[0]
+
+    np.testing.assert_array_equal(batch[1, :2, 0], [10, 12])
+    np.testing.assert_array_equal(batch[1, 2:], np.zeros((3, 2)))
+    np.testing.assert_array_equal(mask.sum(axis=1), [5, 2])
+
+
+def test_remainder_partial(create_reader):
+    dataset = Dataset(create_reader()).window(5).batch(2).remainder(
+        'partial'
+    )
+
+    batches = read_batches(dataset)
+
+    assert len(batches) == 3
+
+    batch, mask = batches[2]
+    assert batch.shape == (1, 5, 2)
+    assert mask.all()
+
+    # No complete window in the remainder
+    dataset = Dataset(create_reader(24)).window(5).batch(2).remainder(
+        'partial'
+    )
+    assert len(read_batches(dataset)) == 2
+
+    # Overlapping windows
+    dataset = Dataset(create_reader()).window(4, 2).batch(4).remainder(
+        'partial'
+    )
+    batches = read_batches(dataset)
+
+    assert [len(batch) for batch, _ in batches] == [4, 4, 3]
+    np.testing.assert_array_equal(batches[-1][0][-1, :, 0], [40, 42, 44, 46])
+
+
+def test_remainder_lines(create_reader):
+    for mode in ['drop', 'pad', 'partial']:
+        for window, shift, batch in [
+            (5, None, 2),
+            (4, 2, 4),
+            (3, 6, 2),
+            (1, None, 3)
+        ]:
+            for lines in range(1, LINES + 1):
+                dataset = Dataset(create_reader(lines)).window(
+                    window, shift
+                ).batch(batch).remainder(mode)
+
+                reads = dataset.max_reads(lines)
+
+                assert reads == len(read_batches(dataset))
+
+                if reads:
+                    assert dataset.lines_need(reads) <= lines
+                    assert dataset.max_reads(
+                        dataset.lines_need(reads)
+                    ) == reads
+
+
+def test_remainder_errors(create_reader):
+    with pytest.raises(ValueError, match='must be one of'):
+        Dataset(create_reader()).remainder('fill')
+
+    dataset = Dataset(create_reader()).window(5)
+    dataset.get()
+
+    with pytest.raises(RuntimeError, match='forbidden'):
+        dataset.remainder('pad')
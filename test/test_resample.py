@@ -0,0 +1,195 @@
+import pytest
+
+import numpy as np
+
+from csv_dataset import (
+    CsvReader,
+    Dataset,
+    ResampleReader
+)
+
+from . import (
+    create_reader as create_ohlcv_reader,
+    read_array
+)
+
+OHLCV = ['open', 'high', 'low', 'close', 'sum']
+
+
+def create_reader(**kwargs):
+    # With the timestamp column
+    return create_ohlcv_reader(indexes=[1, 2, 3, 4, 5, 6], **kwargs)
+
+
+def test_resample_by_count():
+    raw = read_array(create_reader())
+
+    reader = ResampleReader(
+        create_reader(),
+        ['open'] + OHLCV,
+        count=5,
+        chunk_size=7
+    )
+
+    assert reader.max_lines is None
+
+    resampled = read_array(reader)
+
+    assert len(resampled) == 20
+    assert reader.lines == 20
+
+    first = raw[:5]
+
+    np.testing.assert_allclose(resampled[0], [
+        first[0, 0],
+        first[0, 1],
+        first[:, 2].max(),
+        first[:, 3].min(),
+        first[-1, 4],
+        first[:, 5].sum()
+    ])
+
+    np.testing.assert_allclose(resampled[:, 5].sum(), raw[:, 5].sum())
+
+    reader.reset()
+    assert reader.readline() == resampled[0].tolist()
+
+
+def test_resample_by_key():
+    raw = read_array(create_reader())
+
+    # 5 minutes
+    interval = 5 * 60 * 1000
+
+    resampled = read_array(
+        ResampleReader(
+            create_reader(),
+            ['open', 'open', 'high', 'low', 'close', 'mean'],
+            key=0,
+            interval=interval,
+            chunk_size=3
+        )
+    )
+
+    buckets = raw[:, 0] // interval
+    expected_starts = np.unique(buckets)
+
+    assert len(resampled) == len(expected_starts)
+
+    for bar, bucket in zip(resampled, expected_starts):
+        group = raw[buckets == bucket]
+
+        assert bar[0] == group[0, 0]
+        assert bar[2] == group[:, 2].max()
+        assert bar[3] == group[:, 3].min()
+        assert bar[4] == group[-1, 4]
+        assert bar[5] == pytest.approx(group[:, 5].mean())
+
+
+def test_resample_max_lines():
+    reader = ResampleReader(
+        create_reader(max_lines=11),
+        OHLCV + ['sum'],
+        count=5
+    )
+
+    assert reader.max_lines == 3
+    assert len(read_array(reader)) == 3
+
+    reader.max_lines = 1
+    reader.reset()
+    assert len(read_array(reader)) == 1
+
+
+def test_resample_errors():
+    with pytest.raises(ValueError, match='either'):
+        ResampleReader(create_reader(), OHLCV)
+
+    with pytest.raises(ValueError, match='interval'):
+        ResampleReader(create_reader(), OHLCV, count=2, interval=10)
+
+    with pytest.raises(ValueError, match='aggregation'):
+        ResampleReader(create_reader(), [(0, 'median')], count=2)
+
+    with pytest.raises(ValueError, match='expect 6 but got 1'):
+        ResampleReader(create_reader(), ['open'], count=2)
+
+    with pytest.raises(ValueError, match=r'column must be in \[0, 6\)'):
+        ResampleReader(create_reader(), [(6, 'open')], count=2)
+
+    with pytest.raises(ValueError, match='but not both'):
+        ResampleReader(create_reader(), ['open', (1, 'open')], count=2)
+
+    dataset = Dataset(create_reader()).resample(OHLCV + ['sum'], count=2)
+
+    with pytest.raises(TypeError, match='ResampleReader does not support'):
+        dataset.latest()
+
+
+def test_resample_ticks(tmp_path):
+    rng = np.random.default_rng(0)
+
+    # time (ms), price, volume
+    ticks = np.column_stack((
+        np.sort(rng.integers(0, 10 * 60 * 1000, 500)),
+        rng.uniform(100, 200, 500).round(2),
+        rng.uniform(0, 10, 500).round(3)
+    ))
+
+    filepath = tmp_path / 'ticks.csv'
+    filepath.write_text(''.join(
+        f'{int(time)},{price},{volume}\n' for time, price, volume in ticks
+    ))
+
+    interval = 60 * 1000
+
+    bars = read_array(ResampleReader(
+        CsvReader(filepath, float, [0, 1, 2]),
+        [
+            (0, 'open'),
+            (1, 'open'),
+            (1, 'high'),
+            (1, 'low'),
+            (1, 'close'),
+            (2, 'sum')
+        ],
+        key=0,
+        interval=interval,
+        chunk_size=64
+    ))
+
+    buckets = ticks[:, 0] // interval
+    expected = []
+
+    for bucket in np.unique(buckets):
+        group = ticks[buckets == bucket]
+        prices = group[:, 1]
+
+        expected.append([
+            group[0, 0],
+            prices[0],
+            prices.max(),
+            prices.min(),
+            prices[-1],
+            group[:, 2].sum()
+        ])
+
+    assert len(bars) == 10
+    np.testing.assert_allclose(bars, expected)
+
+
+def test_dataset_resample():
+    dataset = Dataset(create_reader()).resample(
+        ['open'] + OHLCV,
+        count=10
+    ).window(3, 1)
+
+    got = dataset.get()
+
+    assert got.shape == (3, 6)
+    assert got[0][1] == 7145.99
+
+    assert len(list(dataset)) == 7
+
+    with pytest.raises(RuntimeError, match='forbidden'):
+        dataset.resample(OHLCV, count=2)
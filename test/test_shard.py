@@ -0,0 +1,94 @@
+import json
+
+import numpy as np
+
+from csv_dataset import (
+    Dataset,
+    ShardReader
+)
+
+from . import create_reader
+
+
+def create_dataset():
+    return Dataset(
+        create_reader()
+    ).window(5, 1).batch(5)
+
+
+def test_save_and_load(tmp_path):
+    dataset = create_dataset()
+
+    assert dataset.save(tmp_path, shard_size=7) == 99
+
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+
+    assert len(manifest['shards']) == 15
+    assert manifest['window'] == dict(size=5, shift=1, stride=1)
+    assert manifest['batch'] == 5
+
+    expected = list(dataset)
+
+    for kwargs in [
+        dict(),
+        dict(mmap_mode=None, workers=2)
+    ]:
+        loaded = Dataset.load(tmp_path, **kwargs)
+
+        assert loaded.max_reads() == 19
+        np.testing.assert_array_equal(list(loaded), expected)
+
+        loaded.reset()
+        np.testing.assert_array_equal(loaded.get(), expected[0])
+
+
+def test_save_features(tmp_path):
+    dataset = create_dataset().features(['mean'])
+    dataset.save(tmp_path)
+
+    loaded = Dataset.load(tmp_path)
+
+    np.testing.assert_array_equal(list(loaded), list(dataset))
+
+
+def test_save_remainder(tmp_path):
+    dataset = create_dataset().batch(4).remainder('pad', -1)
+    dataset.save(tmp_path)
+
+    loaded = Dataset.load(tmp_path)
+
+    assert loaded.max_reads() == 24
+    np.testing.assert_array_equal(list(loaded), list(dataset))
+    assert loaded.mask is None
+
+
+def test_shard_reader(tmp_path):
+    create_dataset().save(tmp_path, shard_size=10)
+
+    reader = ShardReader(tmp_path, max_lines=12)
+
+    assert reader.dtype is float
+    assert reader.max_lines == 12
+
+    first = reader.readline()
+    assert first[0] == 7145.99
+
+    # Across shards
+    assert reader.readlines(10).shape == (10, 5)
+    assert reader.lines == 11
+
+    assert len(reader.readlines(10)) == 1
+    assert reader.readline() is None
+
+    # tail() across shards
+    reader.max_lines = None
+    lines = np.concatenate(list(np.load(path) for path in sorted(
+        tmp_path.glob('shard-*.npy')
+    )))
+
+    for tail in [1, 10, 15, 1000]:
+        reader.tail(tail)
+        np.testing.assert_array_equal(reader.readlines(1000), lines[-tail:])
+
+    loaded = Dataset.load(tmp_path)
+    np.testing.assert_array_equal(loaded.latest(), list(create_dataset())[-1])